@@ -0,0 +1,219 @@
+"""
+Local stand-in for the GitHub API used by the offline benchmarks
+Serves synthetic repositories, paginated PRs/issues and GraphQL totals with
+configurable latency, ETags and rate-limit headers
+"""
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+class MockGitHubState:
+    def __init__(self, open_prs: int = 20, closed_prs: int = 500, open_issues: int = 40,
+                 closed_issues: int = 300, latency: float = 0.0, rate_limit: int = 5000,
+                 fixtures: Optional[Dict] = None):
+        self.counts = {"open_prs": open_prs, "closed_prs": closed_prs,
+                       "open_issues": open_issues, "closed_issues": closed_issues}
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.fixtures = fixtures or {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+
+    def repository(self, repo: str) -> Dict:
+        if repo in self.fixtures: return self.fixtures[repo]
+        seed = int(hashlib.md5(repo.encode()).hexdigest()[:8], 16)
+        return {
+            "full_name": repo,
+            "stargazers_count": seed % 200000,
+            "forks_count": seed % 20000,
+            "watchers_count": seed % 200000,
+            "language": ["Python", "Go", "TypeScript", "Rust", None][seed % 5],
+            "size": seed % 500000,
+            "created_at": "2015-01-01T00:00:00Z",
+            "updated_at": "2024-06-01T00:00:00Z",
+            "open_issues_count": self.counts["open_prs"] + self.counts["open_issues"],
+        }
+
+    @staticmethod
+    def updated_at(index: int) -> str:
+        return f"2024-02-{1 + index % 28:02d}T00:00:00Z"
+
+    def item(self, kind: str, state: str, index: int) -> Dict:
+        offset = {"prs": 0, "issues": 1_000_000}[kind] + (0 if state == "open" else 500_000)
+        day = 1 + index % 28
+        item = {
+            "number": offset + index,
+            "state": state,
+            "title": f"Synthetic {kind[:-1]} {index}",
+            "user": {"login": f"user{index % 97}"},
+            "labels": [{"name": "bug"}] if index % 4 == 0 else [],
+            "created_at": f"2024-01-{day:02d}T00:00:00Z",
+            "updated_at": self.updated_at(index),
+            "closed_at": None if state == "open" else f"2024-02-{day:02d}T00:00:00Z",
+        }
+        if kind == "prs":
+            item["pull_request"] = {}
+            item["merged_at"] = None if state == "open" or index % 3 == 0 else f"2024-02-{day:02d}T00:00:00Z"
+        return item
+
+    def listing(self, endpoint: str, state: str, page: int, per_page: int, since: Optional[str] = None) -> tuple:
+        # Pages are generated on demand: (kind, state) segments are laid out
+        # back to back and only the requested slice is materialized. Like
+        # GitHub, `since` filters the listing before it is paginated.
+        kinds = ["prs"] if endpoint == "pulls" else ["prs", "issues"]
+        states = ["open", "closed"] if state == "all" else [state]
+        segments = []
+        for s in states:
+            for kind in kinds:
+                indices = range(self.counts[f"{s}_{kind}"])
+                if since is not None:
+                    indices = [index for index in indices if self.updated_at(index) >= since]
+                segments.append((kind, s, indices))
+        total = sum(len(indices) for _, _, indices in segments)
+        start, stop = (page - 1) * per_page, min(page * per_page, total)
+        items, position = [], 0
+        for kind, s, indices in segments:
+            for index in indices[max(start - position, 0):max(min(stop - position, len(indices)), 0)]:
+                items.append(self.item(kind, s, index))
+            position += len(indices)
+        return items, max(1, math.ceil(total / per_page))
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    server_version = "MockGitHub/1.0"
+    # Keep-alive like the real API, so pooled client connections are reused.
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY delayed
+    # ACKs would add ~40ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self) -> MockGitHubState:
+        return self.server.state
+
+    def _begin(self) -> bool:
+        with self.state.lock:
+            self.state.requests += 1
+            if time.time() >= self.state.reset_at:
+                self.state.remaining, self.state.reset_at = self.state.rate_limit, int(time.time()) + 3600
+            self.state.remaining -= 1
+            exhausted = self.state.remaining < 0
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        if exhausted:
+            self._send(403, {"message": "API rate limit exceeded"})
+            return False
+        return True
+
+    def _send(self, status: int, body, headers: Optional[Dict] = None) -> None:
+        data = json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+            with self.state.lock:
+                self.state.not_modified += 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("X-RateLimit-Limit", str(self.state.rate_limit))
+        self.send_header("X-RateLimit-Remaining", str(max(self.state.remaining, 0)))
+        self.send_header("X-RateLimit-Reset", str(self.state.reset_at))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        with self.state.lock:
+            self.state.bytes_sent += len(data)
+
+    def do_GET(self):
+        if not self._begin(): return
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        match = re.match(r"^/repos/([^/]+)/([^/]+)(?:/(pulls|issues))?$", url.path)
+        if not match:
+            return self._send(404, {"message": "Not Found"})
+        repo, endpoint = f"{match.group(1)}/{match.group(2)}", match.group(3)
+        if endpoint is None:
+            return self._send(200, self.state.repository(repo))
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        items, last_page = self.state.listing(endpoint, query.get("state", "open"), page, per_page,
+                                              since=query.get("since"))
+        headers = {}
+        if last_page > 1:
+            base = f"http://{self.headers['Host']}{url.path}?state={query.get('state', 'open')}&per_page={per_page}"
+            if "since" in query:
+                base += f"&since={quote(query['since'])}"
+            links = [f'<{base}&page={last_page}>; rel="last"']
+            if page < last_page:
+                links.insert(0, f'<{base}&page={page + 1}>; rel="next"')
+            headers["Link"] = ", ".join(links)
+        self._send(200, items, headers)
+
+    def do_POST(self):
+        if not self._begin(): return
+        if urlparse(self.path).path != "/graphql":
+            return self._send(404, {"message": "Not Found"})
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        variables, data, index = body.get("variables", {}), {}, 0
+        counts = self.state.counts
+        while f"owner{index}" in variables:
+            info = self.state.repository(f"{variables[f'owner{index}']}/{variables[f'name{index}']}")
+            data[f"r{index}"] = {
+                "stargazerCount": info["stargazers_count"],
+                "forkCount": info["forks_count"],
+                "primaryLanguage": {"name": info["language"]} if info["language"] else None,
+                "diskUsage": info["size"],
+                "createdAt": info["created_at"],
+                "updatedAt": info["updated_at"],
+                "openIssues": {"totalCount": counts["open_issues"]},
+                "closedIssues": {"totalCount": counts["closed_issues"]},
+                "openPullRequests": {"totalCount": counts["open_prs"]},
+                "closedPullRequests": {"totalCount": counts["closed_prs"]},
+            }
+            index += 1
+        self._send(200, {"data": data})
+
+class MockHTTPServer(ThreadingHTTPServer):
+    # A deep accept backlog avoids SYN retries when many workers connect at once.
+    request_queue_size = 128
+    daemon_threads = True
+
+class MockGitHubServer:
+    def __init__(self, state: Optional[MockGitHubState] = None, host: str = "127.0.0.1", port: int = 0):
+        self.state = state or MockGitHubState()
+        self.httpd = MockHTTPServer((host, port), MockGitHubHandler)
+        self.httpd.state = self.state
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockGitHubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def load_fixtures(path: str) -> Dict:
+    # Recorded fixtures map "owner/name" to a saved /repos/{owner}/{name} response.
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the IT Dashboard Generator
+Drives the real GitHub client and report generator against a local mock API
+and writes per-stage timings as JSON
+"""
+import argparse
+import copy
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mock_github_server import MockGitHubServer, MockGitHubState, load_fixtures
+from github_api import create_client
+from excel_generator import ITDashboardGenerator
+
+def build_config(base_config: dict, base_url: str, repo_count: int, work_dir: Path, overrides: dict) -> dict:
+    config = copy.deepcopy(base_config)
+    config["github"].update({
+        "api_base_url": base_url,
+        "repositories": [f"bench-org{i % 10}/repo{i:05d}" for i in range(repo_count)],
+        "rate_limit_delay": 0,
+    })
+    config["github"]["cache"] = {**config["github"].get("cache", {}), "dir": str(work_dir / "http_cache")}
+    config["github"]["sync_state_file"] = str(work_dir / "sync_state.json")
+    if config["github"].get("journal_dir"):
+        config["github"]["journal_dir"] = str(work_dir / "journal")
+    config["report"]["output_dir"] = str(work_dir / "reports")
+    if "history" in config:
+        config["history"]["archive_dir"] = str(work_dir / "history")
+    if config["report"].get("chart_cache_dir"):
+        config["report"]["chart_cache_dir"] = str(work_dir / "chart_cache")
+    config["report"]["artifact_store_dir"] = str(work_dir / "artifacts")
+    for dotted_key, value in overrides.items():
+        section = config
+        *parents, key = dotted_key.split(".")
+        for parent in parents:
+            section = section.setdefault(parent, {})
+        section[key] = value
+    return config
+
+def timed(stage_times: dict, stage: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    stage_times[stage] = round(time.perf_counter() - start, 4)
+    return result
+
+def run_scenario(base_config: dict, repo_count: int, args, overrides: dict) -> dict:
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    state = MockGitHubState(open_prs=args.open_prs, closed_prs=args.closed_prs, open_issues=args.open_issues,
+                            closed_issues=args.closed_issues, latency=args.latency,
+                            rate_limit=args.rate_limit, fixtures=fixtures)
+    stage_times = {}
+    with tempfile.TemporaryDirectory(prefix="dashboard-bench-") as tmp, MockGitHubServer(state) as server:
+        work_dir = Path(tmp)
+        config = build_config(base_config, server.base_url, repo_count, work_dir, overrides)
+        data = timed(stage_times, "fetch", create_client(config).collect_all_data)
+        generator = ITDashboardGenerator(config)
+        charts_dir = work_dir / "charts"
+        charts_dir.mkdir()
+        chart_files = {}
+        if config["report"].get("chart_backend", "image") == "image":
+            chart_files = timed(stage_times, "chart_render", generator.create_summary_charts, data, charts_dir)
+        workbook = timed(stage_times, "workbook_build", generator.build_workbook, data, chart_files)
+        report_path = work_dir / "benchmark.xlsx"
+        timed(stage_times, "workbook_save", workbook.save, report_path)
+        return {
+            "repositories": repo_count,
+            "rows": len(data),
+            "stages": stage_times,
+            "total_seconds": round(sum(stage_times.values()), 4),
+            "http_requests": state.requests,
+            "http_not_modified": state.not_modified,
+            "http_bytes": state.bytes_sent,
+            "report_bytes": report_path.stat().st_size,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline against a local mock GitHub API")
+    parser.add_argument("--config", default=str(PROJECT_ROOT / "config" / "settings.json"),
+                        help="Base configuration file (default: config/settings.json)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Portfolio sizes to benchmark (default: 10 100 1000)")
+    parser.add_argument("--open-prs", type=int, default=20)
+    parser.add_argument("--closed-prs", type=int, default=500)
+    parser.add_argument("--open-issues", type=int, default=40)
+    parser.add_argument("--closed-issues", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in seconds")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000, help="Requests per rate-limit window")
+    parser.add_argument("--fixtures", help="JSON file of recorded repository responses keyed by owner/name")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=JSON",
+                        help="Override a config value, e.g. --set github.metrics_mode='\"full\"'")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    with open(args.config, 'r') as f:
+        base_config = json.load(f)
+    overrides = {}
+    for item in args.set:
+        key, _, value = item.partition("=")
+        overrides[key] = json.loads(value)
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "overrides": overrides,
+        "mock": {"open_prs": args.open_prs, "closed_prs": args.closed_prs, "open_issues": args.open_issues,
+                 "closed_issues": args.closed_issues, "latency": args.latency, "rate_limit": args.rate_limit},
+        "scenarios": [],
+    }
+    for size in args.sizes:
+        scenario = run_scenario(base_config, size, args, overrides)
+        results["scenarios"].append(scenario)
+        print(f"{size:>6} repos: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in scenario["stages"].items())
+              + f" ({scenario['http_requests']} requests)")
+    output = Path(args.output) if args.output else (
+        PROJECT_ROOT / "benchmarks" / "results" / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -11,21 +11,19 @@ import logging
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
-from github_api import fetch_github_data
-from excel_generator import generate_excel_report
+# github_api (pandas, requests) and excel_generator (openpyxl, matplotlib) are
+# imported inside the stages that need them to keep short invocations fast.
+from run_metrics import run_metrics
+from utils import DailyLogFileHandler, create_status_file
 
 def setup_logging(config: dict) -> logging.Logger:
     log_dir = Path(config["logging"]["log_dir"])
     log_dir.mkdir(exist_ok=True)
-    log_filename = config["logging"]["log_file"].format(
-        date=datetime.now().strftime("%Y%m%d")
-    )
-    log_path = log_dir / log_filename
     logging.basicConfig(
         level=getattr(logging, config["logging"]["level"]),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_path),
+            DailyLogFileHandler(log_dir, config["logging"]["log_file"]),
             logging.StreamHandler(sys.stdout)
         ]
     )
@@ -47,7 +45,61 @@ def main():
         action="store_true",
         help="Perform a dry run without generating reports"
     )
+    parser.add_argument(
+        "--full-resync",
+        action="store_true",
+        help="Discard incremental sync state and rebuild all counts from scratch"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile and save the stats next to the run report"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume today's interrupted fetch, refetching only failed or missing repositories"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay resident and run on the configured schedule, reusing warm connections and caches"
+    )
+    parser.add_argument(
+        "--fetch-only",
+        action="store_true",
+        help="Fetch GitHub data and write it to a snapshot file without generating a report"
+    )
+    parser.add_argument(
+        "--from-snapshot",
+        metavar="PATH",
+        help="Generate the report from a snapshot file instead of fetching from GitHub"
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="Snapshot file written by --fetch-only (default: report.snapshot_file)"
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="CONFIG",
+        help="Generate one dashboard per config file, fetching each shared repository once"
+    )
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=1,
+        help="Worker processes used to build batch dashboards (default: 1)"
+    )
     args = parser.parse_args()
+    if args.batch:
+        # Batch mode always fetches and writes every team's workbook.
+        conflicts = [flag for flag, value in (("--dry-run", args.dry_run), ("--fetch-only", args.fetch_only),
+                                              ("--from-snapshot", args.from_snapshot), ("--snapshot", args.snapshot),
+                                              ("--daemon", args.daemon)) if value]
+        if conflicts:
+            parser.error(f"--batch cannot be combined with {', '.join(conflicts)}")
     try:
         config_path = Path(args.config)
         if not config_path.exists():
@@ -57,27 +109,125 @@ def main():
         with open(config_path, 'r') as f:
             config = json.load(f)
         logger = setup_logging(config)
-        if args.dry_run:
-            logger.info("DRY RUN MODE - No reports will be generated")
-        logger.info("Fetching GitHub repository data...")
-        data = fetch_github_data(str(config_path))
-        if data.empty:
-            logger.error("No data retrieved from GitHub API")
-            sys.exit(1)
-        logger.info(f"Successfully fetched data for {len(data)} repositories")
-        if not args.dry_run:
-            logger.info("Generating Excel dashboard report...")
-            report_path = generate_excel_report(data, str(config_path))
-            logger.info(f"✓ Dashboard report generated successfully: {report_path}")
+        output_dir = Path(config["report"]["output_dir"])
+        if args.daemon:
+            run_daemon(args, config, logger)
+            return
+        run_metrics.reset()
+        if args.batch:
+            from batch import run_batch
+            task = (run_batch, args.batch, args.batch_workers, args.full_resync, args.resume)
+        else:
+            task = (run, args, config, logger)
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.runcall(*task)
+            finally:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                profile_path = output_dir / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+                profiler.dump_stats(profile_path)
+                logger.info(f"Profile written to {profile_path}")
         else:
-            logger.info("Dry run complete - no report generated")
-        logger.info("IT Dashboard generation completed successfully")
+            task[0](*task[1:])
+        finish(output_dir, "success", "IT Dashboard generation completed successfully", logger,
+               retention_config(args, config))
     except Exception as e:
         if 'logger' in locals():
             logger.error(f"Dashboard generation failed: {e}")
+            if 'output_dir' in locals():
+                finish(output_dir, "error", f"Dashboard generation failed: {e}", logger,
+                       retention_config(args, config))
         else:
             print(f"Error: {e}")
         sys.exit(1)
 
+def run(args, config: dict, logger: logging.Logger, client=None, generator=None) -> None:
+    if args.dry_run:
+        logger.info("DRY RUN MODE - No reports will be generated")
+    if args.from_snapshot:
+        from snapshot import load_snapshot
+        logger.info(f"Loading repository data from snapshot {args.from_snapshot}...")
+        with run_metrics.stage("load_snapshot"):
+            data = load_snapshot(Path(args.from_snapshot))
+    else:
+        from github_api import create_client
+        logger.info("Fetching GitHub repository data...")
+        client = client or create_client(config, full_resync=args.full_resync, resume=args.resume)
+        with run_metrics.stage("fetch"):
+            data = client.collect_all_data()
+    if data.empty:
+        raise RuntimeError("No data retrieved from GitHub API")
+    logger.info(f"Successfully fetched data for {len(data)} repositories")
+    history = config.get("history", {})
+    if history.get("enabled", False) and not args.from_snapshot and not args.dry_run:
+        from history_archive import HistoryArchive
+        with run_metrics.stage("history_append"):
+            HistoryArchive(history.get("archive_dir", "history")).append(data)
+    if args.fetch_only:
+        from snapshot import save_snapshot
+        snapshot_path = Path(args.snapshot or config["report"].get("snapshot_file", "snapshots/latest.feather"))
+        with run_metrics.stage("save_snapshot"):
+            save_snapshot(data, snapshot_path)
+        logger.info("Fetch-only run complete - no report generated")
+    elif not args.dry_run:
+        from excel_generator import ITDashboardGenerator
+        logger.info("Generating Excel dashboard report...")
+        generator = generator or ITDashboardGenerator(config)
+        with run_metrics.stage("report"):
+            report_path = generator.generate_daily_report(data)
+        logger.info(f"✓ Dashboard report generated successfully: {report_path}")
+    else:
+        logger.info("Dry run complete - no report generated")
+    logger.info("IT Dashboard generation completed successfully")
+
+def run_daemon(args, config: dict, logger: logging.Logger) -> None:
+    from scheduler import DashboardDaemon
+    from github_api import create_client
+    from excel_generator import ITDashboardGenerator
+    # One client and generator for the life of the process: the HTTP session,
+    # response cache, rate-limit state and chart worker pool stay warm.
+    client = create_client(config, full_resync=args.full_resync)
+    generator = ITDashboardGenerator(config, persistent=True)
+    output_dir = Path(config["report"]["output_dir"])
+    retained = retention_config(args, config)
+
+    def run_once() -> None:
+        run_metrics.reset()
+        try:
+            run(args, config, logger, client=client, generator=generator)
+        except Exception as e:
+            finish(output_dir, "error", f"Dashboard generation failed: {e}", logger, retained)
+            raise
+        finish(output_dir, "success", "IT Dashboard generation completed successfully", logger, retained)
+
+    try:
+        DashboardDaemon(config, run_once).run_forever()
+    finally:
+        generator.close()
+        client.session.close()
+
+def retention_config(args, config: dict):
+    # Retention only follows runs that write this config's report. Dry and
+    # fetch-only runs must not delete anything, and batch runs already apply
+    # each team's own retention.
+    if args.batch or args.dry_run or args.fetch_only: return None
+    return config
+
+def finish(output_dir: Path, status: str, message: str, logger: logging.Logger, config: dict = None) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    create_status_file(status, message, output_dir)
+    report_file = run_metrics.write(output_dir, status, message)
+    logger.info(f"Run report written to {report_file}")
+    if config:
+        from artifact_store import apply_retention
+        try:
+            removed = apply_retention(config)
+            if removed:
+                logger.info(f"Retention removed {removed} old artifacts")
+        except Exception as e:
+            logger.warning(f"Artifact retention failed: {e}")
+
 if __name__ == "__main__":
     main()
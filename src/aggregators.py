@@ -0,0 +1,23 @@
+"""
+Streaming aggregators for paginated GitHub listings
+Each aggregator folds items one at a time so no listing is held in memory
+"""
+from typing import Dict, Iterable
+
+class CountAggregator:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, item: Dict) -> None:
+        self.count += 1
+
+    def result(self) -> int:
+        return self.count
+
+def consume(items: Iterable[Dict], aggregators: Iterable) -> None:
+    aggregators = list(aggregators)
+    for item in items:
+        for aggregator in aggregators:
+            aggregator.update(item)
@@ -0,0 +1,167 @@
+"""
+Artifact store and retention for generated reports, charts and logs
+Stores chart images once by content hash, hardlinks them into each run's
+chart directory and prunes old artifacts from an append-only index
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from utils import link_or_copy
+
+class ArtifactStore:
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / "objects"
+        self.index_file = self.store_dir / "index.jsonl"
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_new(self) -> bool:
+        return not self.index_file.exists()
+
+    @staticmethod
+    def file_digest(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _object_path(self, digest: str, suffix: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}{suffix}"
+
+    def put(self, path: Path) -> str:
+        # The file at path is replaced by a hardlink to the stored object, so
+        # identical charts from different runs share one copy on disk.
+        path = Path(path)
+        digest = self.file_digest(path)
+        stored = self._object_path(digest, path.suffix)
+        if stored.exists():
+            path.unlink()
+            link_or_copy(stored, path)
+        else:
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            link_or_copy(path, stored)
+        return digest
+
+    def register(self, path: Path, kind: str, digests: Iterable[str] = (), created: Optional[datetime] = None) -> None:
+        entry = {
+            "kind": kind,
+            "path": str(path),
+            "created": (created or datetime.now()).isoformat(),
+            "digests": sorted(set(digests)),
+        }
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        # Single-line appends keep the index safe to extend from batch workers.
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def adopt(self, kind: str, paths: Iterable[Path]) -> None:
+        # Brings artifacts written before the index existed under retention.
+        for path in paths:
+            self.register(path, kind, created=datetime.fromtimestamp(path.stat().st_mtime))
+
+    def _load_index(self) -> tuple:
+        if not self.index_file.exists(): return [], 0
+        entries: Dict[str, Dict] = {}
+        lines = 0
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # A path registered again (the daily log, a reused chart cache
+                # entry) takes its latest timestamp, so retention drops the least
+                # recently used entries first.
+                previous = entries.get(entry["path"])
+                if previous:
+                    previous["created"] = max(previous["created"], entry["created"])
+                    previous["digests"] = sorted(set(previous["digests"]) | set(entry["digests"]))
+                else:
+                    entries[entry["path"]] = entry
+        return list(entries.values()), lines
+
+    def enforce_retention(self, policies: Dict[tuple, Optional[int]]) -> int:
+        # Policies are keyed by (kind, directory), so teams sharing one store
+        # only prune artifacts under their own output and log directories.
+        entries, lines = self._load_index()
+        groups: Dict[tuple, List[Dict]] = {}
+        for entry in entries:
+            groups.setdefault((entry["kind"], str(Path(entry["path"]).parent)), []).append(entry)
+        kept, removed = [], []
+        for key, group in groups.items():
+            group.sort(key=lambda entry: entry["created"], reverse=True)
+            limit = policies.get(key)
+            if limit is None:
+                kept.extend(group)
+                continue
+            kept.extend(group[:limit])
+            removed.extend(group[limit:])
+        for entry in removed:
+            path = Path(entry["path"])
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                elif path.exists():
+                    path.unlink()
+                self.logger.info(f"Cleaned up old {entry['kind']} artifact: {path}")
+            except OSError as e:
+                self.logger.warning(f"Could not remove {path}: {e}")
+        # Objects are dropped once no retained entry references them.
+        referenced = {digest for entry in kept for digest in entry["digests"]}
+        for digest in {digest for entry in removed for digest in entry["digests"]} - referenced:
+            for stored in self._object_path(digest, "").parent.glob(f"{digest}.*"):
+                stored.unlink()
+        # Rewriting also folds repeated registrations back into one line each.
+        if removed or lines != len(kept):
+            self._write_index(kept)
+        return len(removed)
+
+    def _write_index(self, entries: List[Dict]) -> None:
+        temp_path = self.index_file.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in sorted(entries, key=lambda entry: entry["created"]):
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp_path, self.index_file)
+
+def open_store(config: Dict) -> ArtifactStore:
+    report_config = config["report"]
+    store = ArtifactStore(Path(report_config.get("artifact_store_dir", "cache/artifacts")))
+    if store.is_new:
+        output_dir = Path(report_config["output_dir"])
+        log_config = config["logging"]
+        store.adopt("reports", output_dir.glob(report_config["template_name"].format(date="*")))
+        store.adopt("charts", (path for path in (output_dir / "charts").glob("*") if path.is_dir()))
+        store.adopt("logs", Path(log_config["log_dir"]).glob(log_config["log_file"].format(date="*")))
+        if report_config.get("chart_cache_dir"):
+            store.adopt("chart_cache", Path(report_config["chart_cache_dir"]).glob("*.png"))
+        store.store_dir.mkdir(parents=True, exist_ok=True)
+        store.index_file.touch()
+    return store
+
+def apply_retention(config: Dict) -> int:
+    report_config = config["report"]
+    log_config = config["logging"]
+    log_dir = Path(log_config["log_dir"])
+    store = open_store(config)
+    # Today's log may not be registered yet when no report was written.
+    log_file = log_dir / log_config["log_file"].format(date=datetime.now().strftime("%Y%m%d"))
+    if log_file.exists():
+        store.register(log_file, "logs")
+    output_dir = Path(report_config["output_dir"])
+    retention = report_config.get("retention", {})
+    policies = {
+        ("reports", str(output_dir)): retention.get("reports"),
+        ("charts", str(output_dir / "charts")): retention.get("charts"),
+        ("logs", str(log_dir)): log_config.get("max_log_files"),
+    }
+    if report_config.get("chart_cache_dir"):
+        policies[("chart_cache", str(Path(report_config["chart_cache_dir"])))] = retention.get("chart_cache")
+    return store.enforce_retention(policies)
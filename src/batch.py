@@ -0,0 +1,91 @@
+"""
+Batch dashboard generation across several team configurations
+Fetches the union of all configured repositories once and builds every
+team's workbook from the shared dataset
+"""
+import copy
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+import pandas as pd
+from lifecycle import LIFECYCLE_COLUMNS
+from run_metrics import run_metrics
+from utils import load_config, validate_repositories
+
+logger = logging.getLogger(__name__)
+
+def merge_configs(configs: List[Dict]) -> Dict:
+    # Connection, cache and sync settings come from the first config; only the
+    # repository list and lifecycle analytics are combined across teams.
+    merged = copy.deepcopy(configs[0])
+    repositories = []
+    for config in configs:
+        repositories.extend(validate_repositories(config["github"]["repositories"]))
+    merged["github"]["repositories"] = list(dict.fromkeys(repositories))
+    if any(config.get("analytics", {}).get("lifecycle", {}).get("enabled", False) for config in configs):
+        merged.setdefault("analytics", {}).setdefault("lifecycle", {})["enabled"] = True
+    return merged
+
+def team_data(data: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    order = {repo: index for index, repo in enumerate(config["github"]["repositories"])}
+    subset = data[data["repository"].isin(order)]
+    subset = subset.sort_values("repository", key=lambda column: column.map(order)).reset_index(drop=True)
+    if not config.get("analytics", {}).get("lifecycle", {}).get("enabled", False):
+        subset = subset.drop(columns=[column for column in LIFECYCLE_COLUMNS if column in subset.columns])
+    return subset
+
+def _generate_team_report(config: Dict, data: pd.DataFrame) -> str:
+    from excel_generator import ITDashboardGenerator
+    return ITDashboardGenerator(config).generate_daily_report(data)
+
+def run_batch(config_paths: List[str], workers: int = 1, full_resync: bool = False,
+              resume: bool = False) -> Dict[str, str]:
+    from github_api import create_client
+    configs = {path: load_config(path) for path in config_paths}
+    merged = merge_configs(list(configs.values()))
+    total = sum(len(config["github"]["repositories"]) for config in configs.values())
+    logger.info(f"Batch of {len(configs)} dashboards: {len(merged['github']['repositories'])} unique "
+                f"repositories out of {total} configured")
+    with run_metrics.stage("fetch"):
+        data = create_client(merged, full_resync=full_resync, resume=resume).collect_all_data()
+    if data.empty:
+        raise RuntimeError("No data retrieved from GitHub API")
+    jobs = {path: team_data(data, config) for path, config in configs.items()}
+    # Teams sharing an archive directory get one snapshot covering all their repos.
+    archives: Dict[str, set] = {}
+    for config in configs.values():
+        history = config.get("history", {})
+        if history.get("enabled", False):
+            archives.setdefault(history.get("archive_dir", "history"), set()).update(config["github"]["repositories"])
+    if archives:
+        from history_archive import HistoryArchive
+        with run_metrics.stage("history_append"):
+            for archive_dir, repositories in archives.items():
+                HistoryArchive(archive_dir).append(data[data["repository"].isin(repositories)])
+    reports, failures = {}, []
+    with run_metrics.stage("report"):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {path: pool.submit(_generate_team_report, configs[path], subset)
+                           for path, subset in jobs.items()}
+                for path, future in futures.items():
+                    try:
+                        reports[path] = future.result()
+                    except Exception as e:
+                        failures.append(path)
+                        logger.error(f"Dashboard for {path} failed: {e}")
+        else:
+            for path, subset in jobs.items():
+                try:
+                    reports[path] = _generate_team_report(configs[path], subset)
+                except Exception as e:
+                    failures.append(path)
+                    logger.error(f"Dashboard for {path} failed: {e}")
+    for path, report in reports.items():
+        logger.info(f"✓ {path}: {report}")
+    from artifact_store import apply_retention
+    for config in configs.values():
+        apply_retention(config)
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(configs)} dashboards failed: {', '.join(failures)}")
+    return reports
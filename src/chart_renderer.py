@@ -0,0 +1,212 @@
+"""
+Chart rendering for the IT Dashboard
+Renders summary charts with the object-oriented Agg API, in parallel and with a render cache
+"""
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict
+import numpy as np
+import matplotlib
+from matplotlib.artist import setp
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import pandas as pd
+import seaborn as sns
+from run_metrics import run_metrics
+from utils import link_or_copy
+
+# Bump whenever a renderer's output changes so stale cache entries are ignored.
+RENDERER_VERSION = 2
+
+DEFAULT_CHART_SETTINGS = {"dpi": 300, "top_n": 20, "annotate_top": 10, "heatmap_max_columns": 40}
+
+def _new_figure(figsize) -> tuple:
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+def _save(fig: Figure, path: Path, settings: Dict) -> None:
+    fig.savefig(path, dpi=settings["dpi"], bbox_inches='tight', facecolor='white')
+
+def _short_names(data: pd.DataFrame) -> pd.Series:
+    # The typed frame carries the name column; fall back to splitting for raw frames.
+    if 'name' in data.columns:
+        return data['name'].astype(str)
+    return data['repository'].str.split('/').str[1]
+
+def _top_n(data: pd.DataFrame, value_columns: list, top_n: int, sort_by: pd.Series = None,
+           other: str = 'mean') -> pd.DataFrame:
+    # Keeps the largest top_n repositories and folds the rest into one "Other"
+    # row, so element count (and render time) stays bounded for large portfolios.
+    # Bar charts show the bucket's mean so it stays on the same scale; pies need the sum.
+    ranking = sort_by if sort_by is not None else data[value_columns[0]]
+    order = ranking.sort_values(ascending=False, kind='stable').index
+    ranked = data.loc[order]
+    top = ranked.iloc[:top_n][['repository'] + value_columns].copy()
+    top['label'] = _short_names(ranked.iloc[:top_n])
+    rest = ranked.iloc[top_n:]
+    if not rest.empty:
+        bucket = rest[value_columns].agg(other).to_dict()
+        label = f'Other ({len(rest)} repos, avg)' if other == 'mean' else f'Other ({len(rest)} repos)'
+        bucket.update(repository='Other', label=label)
+        top = pd.concat([top, pd.DataFrame([bucket])], ignore_index=True)
+    return top.reset_index(drop=True)
+
+def render_stars(data: pd.DataFrame, path: Path, settings: Dict) -> None:
+    fig, ax = _new_figure((10, 6))
+    data_sorted = _top_n(data, ['stars'], settings["top_n"])
+    bars = ax.bar(range(len(data_sorted)), data_sorted['stars'])
+    ax.set_xlabel('Repository')
+    ax.set_ylabel('Stars Count')
+    ax.set_title('GitHub Repository Stars Comparison', fontsize=14, fontweight='bold')
+    ax.set_xticks(range(len(data_sorted)))
+    ax.set_xticklabels(data_sorted['label'], rotation=45, ha='right')
+    # Only the leading bars are annotated; the "Other" bucket is never labelled.
+    for bar in bars[:min(settings["annotate_top"], settings["top_n"], len(data))]:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height):,}', ha='center', va='bottom')
+    fig.tight_layout()
+    _save(fig, path, settings)
+
+def render_issues_prs(data: pd.DataFrame, path: Path, settings: Dict) -> None:
+    fig, ax = _new_figure((10, 6))
+    if len(data) > settings["top_n"]:
+        data = _top_n(data, ['open_issues', 'open_prs'], settings["top_n"],
+                      sort_by=data['open_issues'] + data['open_prs'])
+    else:
+        data = data.assign(label=_short_names(data))
+    x = range(len(data))
+    width = 0.35
+    ax.bar([i - width/2 for i in x], data['open_issues'], width, label='Open Issues', alpha=0.8)
+    ax.bar([i + width/2 for i in x], data['open_prs'], width, label='Open PRs', alpha=0.8)
+    ax.set_xlabel('Repository')
+    ax.set_ylabel('Count')
+    ax.set_title('Open Issues vs Pull Requests', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(data['label'], rotation=45, ha='right')
+    ax.legend()
+    fig.tight_layout()
+    _save(fig, path, settings)
+
+def render_size_distribution(data: pd.DataFrame, path: Path, settings: Dict) -> None:
+    fig, ax = _new_figure((8, 8))
+    if len(data) > settings["top_n"]:
+        data = _top_n(data, ['size_kb'], settings["top_n"], other='sum')
+    else:
+        data = data.assign(label=_short_names(data))
+    sizes = data['size_kb'] / 1024
+    labels = data['label']
+    wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax.set_title('Repository Size Distribution (MB)', fontsize=14, fontweight='bold')
+    setp(autotexts, size=8, weight="bold")
+    setp(texts, size=9)
+    _save(fig, path, settings)
+
+def render_heatmap(data: pd.DataFrame, path: Path, settings: Dict) -> None:
+    fig, ax = _new_figure((10, 6))
+    metrics_data = data[['stars', 'forks', 'open_issues', 'open_prs']].set_index(_short_names(data).rename('repository'))
+    normalized_data = (metrics_data - metrics_data.min()) / (metrics_data.max() - metrics_data.min())
+    max_columns = settings["heatmap_max_columns"]
+    if len(normalized_data) > max_columns:
+        # Rank by mean normalized score and average consecutive ranks into
+        # max_columns bins, so the heatmap width no longer grows with the portfolio.
+        ranked = normalized_data.assign(_score=normalized_data.mean(axis=1)).sort_values('_score', ascending=False)
+        bins = np.array_split(np.arange(len(ranked)), max_columns)
+        bin_ids = np.repeat(np.arange(len(bins)), [len(b) for b in bins])
+        normalized_data = ranked.drop(columns='_score').groupby(bin_ids).mean()
+        normalized_data.index = [f"#{b[0] + 1}-{b[-1] + 1}" for b in bins]
+    sns.heatmap(normalized_data.T, annot=len(normalized_data) <= settings["top_n"], fmt='.2f', cmap='YlOrRd', cbar_kws={'label': 'Normalized Score'}, ax=ax)
+    ax.set_title('Repository Activity Metrics (Normalized)', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Repository')
+    ax.set_ylabel('Metrics')
+    fig.tight_layout()
+    _save(fig, path, settings)
+
+CHARTS = {
+    'stars': (render_stars, 'stars_comparison.png', ['repository', 'name', 'stars']),
+    'issues_prs': (render_issues_prs, 'issues_vs_prs.png', ['repository', 'name', 'open_issues', 'open_prs']),
+    'size_dist': (render_size_distribution, 'size_distribution.png', ['repository', 'name', 'size_kb']),
+    'heatmap': (render_heatmap, 'activity_heatmap.png', ['repository', 'name', 'stars', 'forks', 'open_issues', 'open_prs']),
+}
+
+def render_chart(name: str, data: pd.DataFrame, path: Path, settings: Dict) -> float:
+    # Runs in worker processes, so style is applied locally rather than relying
+    # on global pyplot state set up in the parent. Returns the render time.
+    start = time.perf_counter()
+    renderer = CHARTS[name][0]
+    style = {'font.size': 10, 'axes.prop_cycle': matplotlib.cycler(color=sns.color_palette("husl"))}
+    with matplotlib.rc_context(style):
+        renderer(data, path, settings)
+    return time.perf_counter() - start
+
+def chart_cache_key(name: str, data: pd.DataFrame, settings: Dict) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps([name, RENDERER_VERSION, settings], sort_keys=True, default=str).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    digest.update(json.dumps([str(dtype) for dtype in data.dtypes]).encode())
+    return digest.hexdigest()
+
+class ChartRenderer:
+    def __init__(self, settings: Dict, cache_dir: Path = None, workers: int = 1, keep_pool: bool = False):
+        self.settings = settings
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.workers = max(1, workers)
+        # keep_pool holds worker processes (with matplotlib already imported)
+        # across render_all calls; the owner must call close().
+        self.keep_pool = keep_pool
+        self._pool = None
+        # Render cache file per chart from the last render_all, for callers
+        # that track cache entries for retention.
+        self.cache_entries: Dict[str, Path] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def render_all(self, data: pd.DataFrame, output_dir: Path) -> Dict[str, Path]:
+        chart_files, pending = {}, {}
+        self.cache_entries = {}
+        for name, (_, filename, columns) in CHARTS.items():
+            chart_data = data[[column for column in columns if column in data.columns]].reset_index(drop=True)
+            path = output_dir / filename
+            chart_files[name] = path
+            key = chart_cache_key(name, chart_data, self.settings)
+            cached = self.cache_dir / f"{key}.png" if self.cache_dir else None
+            if cached: self.cache_entries[name] = cached
+            if cached and cached.exists():
+                link_or_copy(cached, path)
+                run_metrics.record_chart(name, 0.0)
+                self.logger.info(f"Reused cached chart {name}")
+            else:
+                pending[name] = (chart_data, path, cached)
+        if len(pending) > 1 and self.workers > 1:
+            pool = self._get_pool()
+            try:
+                futures = {name: pool.submit(render_chart, name, chart_data, path, self.settings)
+                           for name, (chart_data, path, _) in pending.items()}
+                for name, future in futures.items():
+                    run_metrics.record_chart(name, future.result())
+            finally:
+                if not self.keep_pool:
+                    self.close()
+        else:
+            for name, (chart_data, path, _) in pending.items():
+                run_metrics.record_chart(name, render_chart(name, chart_data, path, self.settings))
+        if self.cache_dir and pending:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for name, (_, path, cached) in pending.items():
+                if cached.exists(): cached.unlink()
+                link_or_copy(path, cached)
+        self.logger.info(f"Rendered {len(pending)} charts, reused {len(CHARTS) - len(pending)} from cache")
+        return chart_files
@@ -3,133 +3,200 @@ Excel Report Generator for IT Dashboard
 Creates Excel reports with charts from GitHub data
 """
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import BarChart, LineChart, PieChart, Reference
 from openpyxl.drawing.image import Image
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 from datetime import datetime
 from pathlib import Path
+from typing import Union
 import json
 import logging
+from artifact_store import open_store
+from lifecycle import LIFECYCLE_COLUMNS
+from run_metrics import run_metrics
 
 class ITDashboardGenerator:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, persistent: bool = False):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        plt.style.use(['default'])
-        sns.set_palette("husl")
+        # A persistent generator keeps its chart worker pool warm between reports.
+        self.persistent = persistent
+        self._chart_renderer = None
 
     def create_summary_charts(self, data: pd.DataFrame, output_dir: Path) -> dict:
-        chart_files = {}
-        plt.rcParams.update({'figure.dpi': 300, 'savefig.dpi': 300, 'font.size': 10})
-
-        # 1. Stars Comparison
-        fig, ax = plt.subplots(figsize=(10, 6))
-        data_sorted = data.sort_values('stars', ascending=False)
-        bars = ax.bar(range(len(data_sorted)), data_sorted['stars'])
-        ax.set_xlabel('Repository')
-        ax.set_ylabel('Stars Count')
-        ax.set_title('GitHub Repository Stars Comparison', fontsize=14, fontweight='bold')
-        ax.set_xticks(range(len(data_sorted)))
-        ax.set_xticklabels(data_sorted['repository'].str.split('/').str[1], rotation=45, ha='right')
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height):,}', ha='center', va='bottom')
-        plt.tight_layout()
-        stars_chart = output_dir / 'stars_comparison.png'
-        plt.savefig(stars_chart, bbox_inches='tight', facecolor='white')
-        plt.close()
-        chart_files['stars'] = stars_chart
-
-        # 2. Open Issues vs PRs
-        fig, ax = plt.subplots(figsize=(10, 6))
-        x = range(len(data))
-        width = 0.35
-        ax.bar([i - width/2 for i in x], data['open_issues'], width, label='Open Issues', alpha=0.8)
-        ax.bar([i + width/2 for i in x], data['open_prs'], width, label='Open PRs', alpha=0.8)
-        ax.set_xlabel('Repository')
-        ax.set_ylabel('Count')
-        ax.set_title('Open Issues vs Pull Requests', fontsize=14, fontweight='bold')
-        ax.set_xticks(x)
-        ax.set_xticklabels(data['repository'].str.split('/').str[1], rotation=45, ha='right')
-        ax.legend()
-        plt.tight_layout()
-        issues_prs_chart = output_dir / 'issues_vs_prs.png'
-        plt.savefig(issues_prs_chart, bbox_inches='tight', facecolor='white')
-        plt.close()
-        chart_files['issues_prs'] = issues_prs_chart
-
-        # 3. Size Distribution
-        fig, ax = plt.subplots(figsize=(8, 8))
-        sizes = data['size_kb'] / 1024
-        labels = data['repository'].str.split('/').str[1]
-        wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-        ax.set_title('Repository Size Distribution (MB)', fontsize=14, fontweight='bold')
-        plt.setp(autotexts, size=8, weight="bold")
-        plt.setp(texts, size=9)
-        pie_chart = output_dir / 'size_distribution.png'
-        plt.savefig(pie_chart, bbox_inches='tight', facecolor='white')
-        plt.close()
-        chart_files['size_dist'] = pie_chart
-
-        # 4. Activity Metrics Heatmap
-        fig, ax = plt.subplots(figsize=(10, 6))
-        metrics_data = data[['repository', 'stars', 'forks', 'open_issues', 'open_prs']].copy()
-        metrics_data['repository'] = metrics_data['repository'].str.split('/').str[1]
-        metrics_data = metrics_data.set_index('repository')
-        normalized_data = (metrics_data - metrics_data.min()) / (metrics_data.max() - metrics_data.min())
-        sns.heatmap(normalized_data.T, annot=True, fmt='.2f', cmap='YlOrRd', cbar_kws={'label': 'Normalized Score'})
-        ax.set_title('Repository Activity Metrics (Normalized)', fontsize=14, fontweight='bold')
-        ax.set_xlabel('Repository')
-        ax.set_ylabel('Metrics')
-        plt.tight_layout()
-        heatmap_chart = output_dir / 'activity_heatmap.png'
-        plt.savefig(heatmap_chart, bbox_inches='tight', facecolor='white')
-        plt.close()
-        chart_files['heatmap'] = heatmap_chart
-
+        # matplotlib/seaborn load only when image charts are actually rendered.
+        from chart_renderer import DEFAULT_CHART_SETTINGS, ChartRenderer
+        report_config = self.config["report"]
+        settings = {**DEFAULT_CHART_SETTINGS, **report_config.get("charts", {})}
+        settings["dpi"] = report_config.get("chart_dpi", settings["dpi"])
+        renderer = self._chart_renderer or ChartRenderer(
+            settings,
+            cache_dir=report_config.get("chart_cache_dir"),
+            workers=report_config.get("chart_workers", 1),
+            keep_pool=self.persistent
+        )
+        if self.persistent:
+            self._chart_renderer = renderer
+        chart_files = renderer.render_all(data, output_dir)
+        self.store_charts(chart_files, renderer.cache_entries, output_dir)
         return chart_files
 
-    def style_worksheet(self, ws, title: str):
+    def store_charts(self, chart_files: dict, cache_entries: dict, charts_dir: Path) -> None:
+        store = open_store(self.config)
+        digests = []
+        for name, path in chart_files.items():
+            digests.append(store.put(path))
+            cached = cache_entries.get(name)
+            if cached is not None and cached.exists():
+                # Relinking the render cache entry to the stored object leaves one
+                # copy on disk, and registering it puts the cache under retention.
+                store.put(cached)
+                store.register(cached, "chart_cache", [digests[-1]])
+        store.register(charts_dir, "charts", digests)
+
+    def close(self) -> None:
+        if self._chart_renderer:
+            self._chart_renderer.close()
+            self._chart_renderer = None
+
+    @staticmethod
+    def create_native_charts(data: pd.DataFrame, detail_ws) -> list:
+        # Series reference the "Repository Details" sheet: title in row 1,
+        # header in row 2, one repository per row from row 3.
+        first_row, last_row = 2, len(data) + 2
+        column = {name: index for index, name in enumerate(data.columns, start=1)}
+        categories = Reference(detail_ws, min_col=column['repository'], min_row=first_row + 1, max_row=last_row)
+
+        def bar_chart(title: str, y_title: str, series: list) -> BarChart:
+            chart = BarChart()
+            chart.type = "col"
+            chart.title = title
+            chart.x_axis.title = 'Repository'
+            chart.y_axis.title = y_title
+            for name in series:
+                chart.add_data(Reference(detail_ws, min_col=column[name], min_row=first_row, max_row=last_row),
+                               titles_from_data=True)
+            chart.set_categories(categories)
+            chart.width, chart.height = 24, 10
+            return chart
+
+        stars_chart = bar_chart('GitHub Repository Stars Comparison', 'Stars Count', ['stars'])
+        stars_chart.legend = None
+        issues_prs_chart = bar_chart('Open Issues vs Pull Requests', 'Count', ['open_issues', 'open_prs'])
+        size_chart = PieChart()
+        size_chart.title = 'Repository Size Distribution (KB)'
+        size_chart.add_data(Reference(detail_ws, min_col=column['size_kb'], min_row=first_row, max_row=last_row),
+                            titles_from_data=True)
+        size_chart.set_categories(categories)
+        size_chart.width, size_chart.height = 16, 10
+        activity_chart = bar_chart('Repository Activity Metrics', 'Count', ['forks', 'open_issues', 'open_prs'])
+        return [stars_chart, issues_prs_chart, size_chart, activity_chart]
+
+    def load_trends(self) -> pd.DataFrame:
+        history = self.config.get("history", {})
+        if not history.get("enabled", False): return pd.DataFrame()
+        from history_archive import HistoryArchive
+        archive = HistoryArchive(history.get("archive_dir", "history"))
+        return archive.trends(history.get("trend_period", "weekly"), history.get("trend_periods", 52),
+                              repositories=self.config["github"]["repositories"])
+
+    @staticmethod
+    def create_trend_charts(trends: pd.DataFrame, trends_ws) -> list:
+        # Same layout as the details sheet: header in row 2, periods from row 3.
+        first_row, last_row = 2, len(trends) + 2
+        column = {name: index for index, name in enumerate(trends.columns, start=1)}
+        categories = Reference(trends_ws, min_col=column['period_start'], min_row=first_row + 1, max_row=last_row)
+
+        def line_chart(title: str, series: list) -> LineChart:
+            chart = LineChart()
+            chart.title = title
+            chart.x_axis.title = 'Period'
+            chart.y_axis.title = 'Change'
+            chart.x_axis.number_format = 'yyyy-mm-dd'
+            for name in series:
+                if name in column:
+                    chart.add_data(Reference(trends_ws, min_col=column[name], min_row=first_row, max_row=last_row),
+                                   titles_from_data=True)
+            chart.set_categories(categories)
+            chart.width, chart.height = 24, 10
+            return chart
+
+        return [
+            line_chart('Star & Fork Growth', ['stars_delta', 'forks_delta']),
+            line_chart('Open Issue & PR Changes', ['open_issues_delta', 'open_prs_delta']),
+        ]
+
+    @staticmethod
+    def column_widths(data: pd.DataFrame) -> list:
+        # Same rule as sizing cell by cell (longest str() of header or value,
+        # plus 2, capped at 50), computed column-wise on the DataFrame. Missing
+        # values may stay NaN after astype(str) and count as empty cells.
+        widths = []
+        for column in data.columns:
+            lengths = data[column].astype(str).str.len().fillna(0)
+            max_length = max(len(str(column)), int(lengths.max()) if len(lengths) else 0)
+            widths.append(min(max_length + 2, 50))
+        return widths
+
+    def write_styled_sheet(self, wb: Workbook, sheet_name: str, title: str, data: pd.DataFrame):
+        # Write-only sheets are streamed row by row, so the title row is emitted
+        # first and column widths are fixed before any data row is written.
+        ws = wb.create_sheet(sheet_name)
+        for index, width in enumerate(self.column_widths(data), start=1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+        title_cell = WriteOnlyCell(ws, value=title)
+        title_cell.font = Font(bold=True, size=16, color="366092")
+        ws.append([title_cell])
+        ws.merged_cells.add(f'A1:{get_column_letter(max(len(data.columns), 1))}1')
         header_font = Font(bold=True, color="FFFFFF")
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         header_alignment = Alignment(horizontal="center", vertical="center")
-        for cell in ws[1]:
+        header = []
+        for column in data.columns:
+            cell = WriteOnlyCell(ws, value=column)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        ws.insert_rows(1)
-        ws['A1'] = title
-        ws['A1'].font = Font(bold=True, size=16, color="366092")
-        ws.merge_cells(f'A1:{ws.max_column}1')
+            header.append(cell)
+        ws.append(header)
+        for r in dataframe_to_rows(data, index=False, header=False):
+            ws.append(r)
+        return ws
 
     def create_dashboard_report(self, data: pd.DataFrame) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_name = self.config["report"]["template_name"].format(date=timestamp)
         output_dir = Path(self.config["report"]["output_dir"])
-        output_path = Path("reports") / report_name
+        output_path = output_dir / report_name
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        charts_dir = output_path.parent / "charts" / timestamp
-        charts_dir.mkdir(parents=True, exist_ok=True)
-        chart_files = self.create_summary_charts(data, charts_dir)
-        wb = Workbook()
-        wb.remove(wb.active)
-        summary_ws = wb.create_sheet("Dashboard Summary")
+        chart_backend = self.config["report"].get("chart_backend", "image")
+        include_charts = self.config["report"].get("include_charts", True)
+        chart_files = {}
+        store = open_store(self.config)
+        if include_charts and chart_backend == "image":
+            charts_dir = output_path.parent / "charts" / timestamp
+            charts_dir.mkdir(parents=True, exist_ok=True)
+            with run_metrics.stage("chart_render"):
+                chart_files = self.create_summary_charts(data, charts_dir)
+        with run_metrics.stage("history_trends"):
+            trends = self.load_trends()
+        with run_metrics.stage("workbook_build"):
+            wb = self.build_workbook(data, chart_files, trends)
+        with run_metrics.stage("workbook_save"):
+            wb.save(output_path)
+        store.register(output_path, "reports")
+        self.logger.info(f"✓ Excel dashboard saved: {output_path}")
+        return str(output_path)
+
+    def build_workbook(self, data: pd.DataFrame, chart_files: dict, trends: pd.DataFrame = None) -> Workbook:
+        chart_backend = self.config["report"].get("chart_backend", "image")
+        include_charts = self.config["report"].get("include_charts", True)
+        wb = Workbook(write_only=True)
         summary_data = [
-            ["Metric", "Value"],
             ["Total Repositories", len(data)],
             ["Total Stars", data['stars'].sum()],
             ["Total Forks", data['forks'].sum()],
@@ -139,15 +206,30 @@ class ITDashboardGenerator:
             ["Most Popular Language", data['language'].mode().iloc[0] if not data['language'].mode().empty else "N/A"],
             ["Report Generated", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
         ]
-        for row in summary_data:
-            summary_ws.append(row)
-        self.style_worksheet(summary_ws, "IT Dashboard Summary")
-        detail_ws = wb.create_sheet("Repository Details")
-        for r in dataframe_to_rows(data, index=False, header=True):
-            detail_ws.append(r)
-        self.style_worksheet(detail_ws, "Detailed Repository Data")
+        summary_df = pd.DataFrame(summary_data, columns=["Metric", "Value"], dtype=object)
+        self.write_styled_sheet(wb, "Dashboard Summary", "IT Dashboard Summary", summary_df)
+        detail_ws = self.write_styled_sheet(wb, "Repository Details", "Detailed Repository Data", data)
+        lifecycle_columns = [column for column in LIFECYCLE_COLUMNS if column in data.columns]
+        if lifecycle_columns:
+            lifecycle_data = data[['repository'] + lifecycle_columns]
+            # Repos without merged PRs or open items have NaN percentiles; leave those cells empty.
+            lifecycle_data = lifecycle_data.astype(object).where(lifecycle_data.notna(), None)
+            self.write_styled_sheet(wb, "Lifecycle Analytics", "PR & Issue Lifecycle Analytics", lifecycle_data)
+        if trends is not None and not trends.empty:
+            trends_ws = self.write_styled_sheet(wb, "Trends", "Repository Metric Trends", trends)
+            row_position = 2
+            for chart in self.create_trend_charts(trends, trends_ws):
+                trends_ws.add_chart(chart, f'{get_column_letter(len(trends.columns) + 2)}{row_position}')
+                row_position += 22
         charts_ws = wb.create_sheet("Visual Analytics")
+        title_cell = WriteOnlyCell(charts_ws, value="Visual Analytics Dashboard")
+        title_cell.font = Font(bold=True, size=16, color="366092")
+        charts_ws.append([title_cell])
         row_position = 2
+        if include_charts and chart_backend == "native":
+            for chart in self.create_native_charts(data, detail_ws):
+                charts_ws.add_chart(chart, f'A{row_position}')
+                row_position += 22
         for chart_name, chart_path in chart_files.items():
             try:
                 img = Image(str(chart_path))
@@ -157,11 +239,7 @@ class ITDashboardGenerator:
                 row_position += 22
             except Exception as e:
                 self.logger.warning(f"Could not insert chart {chart_name}: {e}")
-        charts_ws['A1'] = "Visual Analytics Dashboard"
-        charts_ws['A1'].font = Font(bold=True, size=16, color="366092")
-        wb.save(output_path)
-        self.logger.info(f"✓ Excel dashboard saved: {output_path}")
-        return str(output_path)
+        return wb
 
     def generate_daily_report(self, data: pd.DataFrame) -> str:
         try:
@@ -176,9 +254,10 @@ class ITDashboardGenerator:
             self.logger.error(f"Error generating dashboard report: {e}")
             raise
 
-def generate_excel_report(data: pd.DataFrame, config_path: str) -> str:
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+def generate_excel_report(data: pd.DataFrame, config: Union[str, dict]) -> str:
+    if not isinstance(config, dict):
+        with open(config, 'r') as f:
+            config = json.load(f)
     logging.basicConfig(
         level=getattr(logging, config["logging"]["level"]),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -0,0 +1,84 @@
+"""
+Per-repository checkpoint journal for GitHub fetch runs
+Appends each collected row or failure to a daily JSONL file so an
+interrupted run can resume without refetching finished repositories
+"""
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+def _json_default(value):
+    # NumPy scalars from the lifecycle metrics serialize as plain numbers.
+    return value.item() if hasattr(value, "item") else str(value)
+
+class FetchJournal:
+    def __init__(self, journal_dir: Path, resume: bool = False, day: Optional[str] = None):
+        self.journal_dir = Path(journal_dir)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        self.path = self.journal_dir / f"fetch_{day or datetime.now().strftime('%Y%m%d')}.jsonl"
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Dict] = {}
+        self._failures: Dict[str, str] = {}
+        # Journals from earlier days can never be resumed, so only today's is kept.
+        for old_journal in self.journal_dir.glob("fetch_*.jsonl"):
+            if old_journal != self.path:
+                old_journal.unlink()
+        if resume and self.path.exists():
+            self._load()
+            mode = 'a'
+        else:
+            mode = 'w'
+        self._file = open(self.path, mode, encoding='utf-8')
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run killed mid-write leaves at most one truncated line.
+                    self.logger.warning(f"Skipping truncated journal entry in {self.path}")
+                    continue
+                if entry["status"] == "ok":
+                    self._rows[entry["repository"]] = entry["row"]
+                    self._failures.pop(entry["repository"], None)
+                elif entry["repository"] not in self._rows:
+                    self._failures[entry["repository"]] = entry.get("error", "")
+
+    def _append(self, entry: Dict) -> None:
+        line = json.dumps(entry, default=_json_default)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def record(self, repo: str, row: Dict) -> None:
+        with self._lock:
+            self._rows[repo] = row
+            self._failures.pop(repo, None)
+        self._append({"repository": repo, "status": "ok", "row": row})
+
+    def record_failure(self, repo: str, error: str) -> None:
+        with self._lock:
+            self._failures[repo] = error
+        self._append({"repository": repo, "status": "failed", "error": error,
+                      "timestamp": datetime.now().isoformat()})
+
+    def completed(self) -> set:
+        with self._lock:
+            return set(self._rows)
+
+    def failures(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._failures)
+
+    def rows(self, repositories: List[str]) -> List[Dict]:
+        with self._lock:
+            return [self._rows[repo] for repo in repositories if repo in self._rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
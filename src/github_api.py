@@ -4,111 +4,419 @@ Fetches repository statistics, pull requests, and issues data
 """
 import requests
 import json
+import os
+import re
 import time
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Union
 import pandas as pd
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from aggregators import CountAggregator, consume
+from fetch_journal import FetchJournal
+from http_cache import ResponseCache
+from lifecycle import LifecycleAggregator, compute_lifecycle_metrics
+from rate_limiter import RateLimiter
+from repository_frame import build_repository_frame
+from run_metrics import run_metrics
+from sync_state import SyncStateStore, apply_item_delta
+
+class IncompleteListingError(Exception):
+    pass
 
 class GitHubAPIClient:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, full_resync: bool = False, resume: bool = False):
         self.config = config
         self.base_url = config["github"]["api_base_url"]
         self.repositories = config["github"]["repositories"]
         self.rate_limit_delay = config["github"]["rate_limit_delay"]
         self.timeout = config["github"]["timeout"]
+        self.metrics_mode = config["github"].get("metrics_mode", "full")
+        self.max_workers = max(1, config["github"].get("max_workers", 1))
+        self.request_budget = config["github"].get("request_budget")
+        self.max_retries = config["github"].get("max_retries", 5)
+        self._request_count = 0
+        self._budget_lock = threading.Lock()
+        self.rate_limiter = RateLimiter(self.rate_limit_delay, max_backoff=config["github"].get("max_backoff", 300),
+                                        rate_limit_floor=config["github"].get("rate_limit_floor", 60))
+        self._slots = threading.BoundedSemaphore(
+            config["github"].get("max_concurrent_requests", self.max_workers)
+        )
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "IT-Dashboard-Generator/1.0"
         })
+        token = os.environ.get(config["github"].get("token_env", "GITHUB_TOKEN"))
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
         self.logger = logging.getLogger(__name__)
+        cache_config = config["github"].get("cache", {})
+        self.cache = None
+        if cache_config.get("enabled", False):
+            self.cache = ResponseCache(Path(cache_config.get("dir", "cache/http")),
+                                       cache_config.get("max_size_mb", 256))
+        lifecycle_config = config.get("analytics", {}).get("lifecycle", {})
+        self.lifecycle_enabled = lifecycle_config.get("enabled", False)
+        self.throughput_weeks = lifecycle_config.get("throughput_weeks", 12)
+        if self.lifecycle_enabled and self.metrics_mode != "full":
+            # Lifecycle metrics need every item, so counts come from the same stream.
+            self.logger.info(f"Lifecycle analytics enabled - streaming full listings instead of {self.metrics_mode} mode")
+            self.metrics_mode = "full"
+        self.sync_state = None
+        if self.metrics_mode == "incremental":
+            self.sync_state = SyncStateStore(Path(config["github"].get("sync_state_file", "state/sync_state.json")))
+            if full_resync:
+                self.logger.info("Full resync requested - discarding incremental sync state")
+                self.sync_state.clear()
+        self.journal_dir = config["github"].get("journal_dir")
+        self.resume = resume
+        self.journal: Optional[FetchJournal] = None
+        self.failed_repositories: Dict[str, str] = {}
 
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        try:
-            time.sleep(self.rate_limit_delay)
-            response = self.session.get(url, params=params, timeout=self.timeout)
+    def _consume_budget(self) -> bool:
+        with self._budget_lock:
+            if self.request_budget is not None and self._request_count >= self.request_budget:
+                return False
+            self._request_count += 1
+            return True
+
+    def _request(self, url: str, params: Optional[Dict] = None,
+                 json_body: Optional[Dict] = None) -> Optional[requests.Response]:
+        # json_body switches to an uncached POST (used for GraphQL queries).
+        entry = self.cache.lookup(url, params) if self.cache and json_body is None else None
+        for attempt in range(self.max_retries + 1):
+            if not self._consume_budget():
+                self.logger.error(f"Request budget of {self.request_budget} exhausted, skipping {url}")
+                return None
+            if attempt:
+                run_metrics.increment("retries")
+            waited = self.rate_limiter.acquire()
+            if waited:
+                run_metrics.increment("rate_limit_wait_seconds", waited)
+            run_metrics.increment("http_requests")
+            try:
+                with self._slots:
+                    if json_body is not None:
+                        response = self.session.post(url, json=json_body, timeout=self.timeout)
+                    else:
+                        response = self.session.get(url, params=params, timeout=self.timeout,
+                                                    headers=ResponseCache.conditional_headers(entry))
+            except requests.RequestException as e:
+                self.logger.warning(f"Request error for {url}: {str(e)} (attempt {attempt + 1})")
+                if attempt < self.max_retries:
+                    time.sleep(self.rate_limiter.backoff(attempt))
+                continue
+            self.rate_limiter.update(response.headers)
+            run_metrics.increment("http_bytes", len(response.content))
+            if response.status_code == 304 and entry:
+                run_metrics.increment("http_not_modified")
+                return self.cache.hit(url, params, entry)
             if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 403:
-                self.logger.warning(f"Rate limit hit for {url}")
-                time.sleep(60)
-                return self._make_request(url, params)
+                if self.cache and json_body is None: self.cache.miss(url, params, response)
+                return response
+            if RateLimiter.is_rate_limited(response.status_code, response.headers, response.text):
+                delay = self.rate_limiter.backoff(attempt, response.headers, block_all=True)
+                self.logger.warning(f"Rate limit hit for {url}, pausing requests for {delay:.1f}s")
+            elif response.status_code >= 500:
+                delay = self.rate_limiter.backoff(attempt)
+                self.logger.warning(f"Server error {response.status_code} for {url}, retrying in {delay:.1f}s")
+                time.sleep(delay)
             else:
                 self.logger.error(f"API request failed: {response.status_code} - {url}")
                 return None
-        except requests.RequestException as e:
-            self.logger.error(f"Request error for {url}: {str(e)}")
+        self.logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts")
+        return None
+
+    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        response = self._request(url, params)
+        return response.json() if response is not None else None
+
+    def _count_items(self, url: str, params: Dict, strict: bool = False) -> Optional[int]:
+        # With per_page=1 the page number of the "last" link equals the total
+        # item count, so any listing can be counted with a single request.
+        # A failed request returns None rather than a count of zero, or raises
+        # with strict=True like iter_pages.
+        response = self._request(url, {**params, "per_page": 1})
+        if response is None:
+            if strict: raise IncompleteListingError(f"Failed to count items of {url}")
             return None
+        run_metrics.increment("pages_fetched")
+        last_url = response.links.get("last", {}).get("url")
+        if last_url:
+            match = re.search(r"[?&]page=(\d+)", last_url)
+            if match: return int(match.group(1))
+        return len(response.json())
+
+    def iter_pages(self, url: str, params: Dict, strict: bool = False) -> Iterator[List[Dict]]:
+        # Yields one page at a time so consumers never hold more than a page.
+        # With strict=True a failed page raises instead of ending the listing,
+        # letting callers that persist state avoid committing partial results.
+        params = {**params, "per_page": 100}
+        page = 1
+        while True:
+            params["page"] = page
+            response = self._make_request(url, params)
+            if response is None and strict:
+                raise IncompleteListingError(f"Failed to fetch page {page} of {url}")
+            if not response: return
+            run_metrics.increment("pages_fetched")
+            yield response
+            if len(response) < 100: return
+            page += 1
 
     def get_repository_info(self, repo: str) -> Optional[Dict]:
         url = f"{self.base_url}/repos/{repo}"
         return self._make_request(url)
 
+    def iter_pull_requests(self, repo: str, state: str = "open", strict: bool = False) -> Iterator[Dict]:
+        for page in self.iter_pages(f"{self.base_url}/repos/{repo}/pulls", {"state": state}, strict=strict):
+            yield from page
+
+    def iter_issues(self, repo: str, state: str = "open", strict: bool = False) -> Iterator[Dict]:
+        for page in self.iter_pages(f"{self.base_url}/repos/{repo}/issues", {"state": state}, strict=strict):
+            yield from (issue for issue in page if "pull_request" not in issue)
+
     def get_pull_requests(self, repo: str, state: str = "open") -> List[Dict]:
-        url = f"{self.base_url}/repos/{repo}/pulls"
-        params = {"state": state, "per_page": 100}
-        prs, page = [], 1
-        while True:
-            params["page"] = page
-            response = self._make_request(url, params)
-            if not response: break
-            prs.extend(response)
-            if len(response) < 100: break
-            page += 1
-        return prs
+        return list(self.iter_pull_requests(repo, state))
 
     def get_issues(self, repo: str, state: str = "open") -> List[Dict]:
+        return list(self.iter_issues(repo, state))
+
+    def _item_aggregators(self, kind: str, state: str) -> Dict:
+        aggregators = {"count": CountAggregator()}
+        if self.lifecycle_enabled:
+            aggregators["lifecycle"] = LifecycleAggregator()
+        return aggregators
+
+    def aggregate_items(self, repo: str, kind: str, state: str) -> Dict:
+        # Strict listings raise IncompleteListingError on a failed page, so a
+        # truncated stream marks the repository failed instead of undercounting.
+        if kind == "prs":
+            items = self.iter_pull_requests(repo, state, strict=True)
+        else:
+            items = self.iter_issues(repo, state, strict=True)
+        aggregators = self._item_aggregators(kind, state)
+        consume(items, aggregators.values())
+        return {name: aggregator.result() for name, aggregator in aggregators.items()}
+
+    def count_pull_requests(self, repo: str, state: str = "open", strict: bool = False) -> Optional[int]:
+        return self._count_items(f"{self.base_url}/repos/{repo}/pulls", {"state": state}, strict=strict)
+
+    def count_issues_and_prs(self, repo: str, state: str = "open", strict: bool = False) -> Optional[int]:
+        # The issues endpoint lists pull requests too; callers subtract PR counts.
+        return self._count_items(f"{self.base_url}/repos/{repo}/issues", {"state": state}, strict=strict)
+
+    def sync_repository_counts(self, repo: str) -> Optional[Dict[str, int]]:
         url = f"{self.base_url}/repos/{repo}/issues"
-        params = {"state": state, "per_page": 100}
-        issues, page = [], 1
-        while True:
-            params["page"] = page
-            response = self._make_request(url, params)
-            if not response: break
-            filtered_issues = [issue for issue in response if "pull_request" not in issue]
-            issues.extend(filtered_issues)
-            if len(response) < 100: break
-            page += 1
-        return issues
+        sync_started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        state = self.sync_state.get(repo)
+        try:
+            if state is None:
+                state = {"open_prs": set(), "open_issues": set()}
+                for page in self.iter_pages(url, {"state": "open"}, strict=True):
+                    for item in page:
+                        state["open_prs" if "pull_request" in item else "open_issues"].add(item["number"])
+                # Closed totals become the permanent baseline, so a failed count must not be saved as 0.
+                state["closed_prs"] = self.count_pull_requests(repo, "closed", strict=True)
+                closed_items = self.count_issues_and_prs(repo, "closed", strict=True)
+                state["closed_issues"] = max(closed_items - state["closed_prs"], 0)
+                self.logger.info(f"Built sync baseline for {repo}")
+            else:
+                updated = 0
+                for page in self.iter_pages(url, {"state": "all", "since": state["last_sync"]}, strict=True):
+                    for item in page:
+                        apply_item_delta(state, item, state["last_sync"])
+                    updated += len(page)
+                self.logger.info(f"Applied {updated} updated items to {repo}")
+        except IncompleteListingError as e:
+            self.logger.warning(f"Incremental sync failed for {repo}, keeping previous state: {e}")
+            return None
+        state["last_sync"] = sync_started
+        self.sync_state.put(repo, state)
+        return {"open_prs": len(state["open_prs"]), "closed_prs": state["closed_prs"],
+                "open_issues": len(state["open_issues"]), "closed_issues": state["closed_issues"]}
 
-    def collect_all_data(self) -> pd.DataFrame:
+    def _repo_tasks(self, repo: str) -> Dict:
+        if self.metrics_mode == "incremental":
+            return {
+                "repo_info": (self.get_repository_info, (repo,)),
+                "sync": (self.sync_repository_counts, (repo,)),
+            }
+        if self.metrics_mode == "count":
+            return {
+                "repo_info": (self.get_repository_info, (repo,)),
+                "open_prs": (self.count_pull_requests, (repo, "open")),
+                "closed_prs": (self.count_pull_requests, (repo, "closed")),
+                "closed_issues_and_prs": (self.count_issues_and_prs, (repo, "closed")),
+            }
+        return {
+            "repo_info": (self.get_repository_info, (repo,)),
+            "open_prs": (self.aggregate_items, (repo, "prs", "open")),
+            "closed_prs": (self.aggregate_items, (repo, "prs", "closed")),
+            "open_issues": (self.aggregate_items, (repo, "issues", "open")),
+            "closed_issues": (self.aggregate_items, (repo, "issues", "closed")),
+        }
+
+    def _counts(self, results: Dict) -> Optional[Dict[str, int]]:
+        if self.metrics_mode == "incremental":
+            return results["sync"]
+        if self.metrics_mode == "count":
+            if any(results[key] is None for key in ("open_prs", "closed_prs", "closed_issues_and_prs")):
+                return None
+            open_prs, closed_prs = results["open_prs"], results["closed_prs"]
+            # open_issues_count on the repository also includes open pull requests
+            open_issues = max(results["repo_info"].get("open_issues_count", 0) - open_prs, 0)
+            closed_issues = max(results["closed_issues_and_prs"] - closed_prs, 0)
+            return {"open_prs": open_prs, "closed_prs": closed_prs,
+                    "open_issues": open_issues, "closed_issues": closed_issues}
+        return {key: results[key]["count"] for key in ("open_prs", "closed_prs", "open_issues", "closed_issues")}
+
+    def _build_row(self, repo: str, results: Dict) -> Optional[Dict]:
+        repo_info = results["repo_info"]
+        if not repo_info: return None
+        counts = self._counts(results)
+        if counts is None: return None
+        open_prs, closed_prs = counts["open_prs"], counts["closed_prs"]
+        open_issues, closed_issues = counts["open_issues"], counts["closed_issues"]
+        repo_data = {
+            "repository": repo,
+            "stars": repo_info.get("stargazers_count", 0),
+            "forks": repo_info.get("forks_count", 0),
+            "watchers": repo_info.get("watchers_count", 0),
+            "open_prs": open_prs,
+            "closed_prs": closed_prs,
+            "open_issues": open_issues,
+            "closed_issues": closed_issues,
+            "total_prs": open_prs + closed_prs,
+            "total_issues": open_issues + closed_issues,
+            "language": repo_info.get("language", "Unknown"),
+            "size_kb": repo_info.get("size", 0),
+            "created_at": repo_info.get("created_at", ""),
+            "updated_at": repo_info.get("updated_at", ""),
+            "fetch_timestamp": datetime.now().isoformat()
+        }
+        if self.lifecycle_enabled:
+            repo_data.update(compute_lifecycle_metrics(
+                {key: results[key]["lifecycle"] for key in ("open_prs", "closed_prs", "open_issues", "closed_issues")},
+                self.throughput_weeks
+            ))
+        return repo_data
+
+    def _timed_task(self, repo: str, func, *args):
+        # Per-repository time is the sum of its endpoint calls, which stays
+        # meaningful when those calls overlap in the concurrent mode.
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            run_metrics.add_repository_time(repo, time.perf_counter() - start)
+
+    def _checkpoint(self, repo: str, results: Dict, repo_data: Optional[Dict]) -> None:
+        if repo_data is None:
+            reason = "repository info unavailable" if not results.get("repo_info") else "item counts incomplete"
+            self._record_failure(repo, reason)
+            return
+        if self.journal: self.journal.record(repo, repo_data)
+        self.logger.info(f"✓ Collected data for {repo}")
+
+    def _record_failure(self, repo: str, reason: str) -> None:
+        self.failed_repositories[repo] = reason
+        self.logger.error(f"✗ Failed to collect data for {repo}: {reason}")
+        if self.journal: self.journal.record_failure(repo, reason)
+
+    def _collect_serial(self, repositories: List[str]) -> List[Dict]:
         all_data = []
-        for repo in self.repositories:
+        for repo in repositories:
             self.logger.info(f"Fetching data for {repo}")
-            repo_info = self.get_repository_info(repo)
-            if not repo_info: continue
-            open_prs = self.get_pull_requests(repo, "open")
-            closed_prs = self.get_pull_requests(repo, "closed")
-            open_issues = self.get_issues(repo, "open")
-            closed_issues = self.get_issues(repo, "closed")
-            repo_data = {
-                "repository": repo,
-                "stars": repo_info.get("stargazers_count", 0),
-                "forks": repo_info.get("forks_count", 0),
-                "watchers": repo_info.get("watchers_count", 0),
-                "open_prs": len(open_prs),
-                "closed_prs": len(closed_prs),
-                "open_issues": len(open_issues),
-                "closed_issues": len(closed_issues),
-                "total_prs": len(open_prs) + len(closed_prs),
-                "total_issues": len(open_issues) + len(closed_issues),
-                "language": repo_info.get("language", "Unknown"),
-                "size_kb": repo_info.get("size", 0),
-                "created_at": repo_info.get("created_at", ""),
-                "updated_at": repo_info.get("updated_at", ""),
-                "fetch_timestamp": datetime.now().isoformat()
-            }
-            all_data.append(repo_data)
-            self.logger.info(f"✓ Collected data for {repo}")
-        return pd.DataFrame(all_data)
+            try:
+                results = {"repo_info": self._timed_task(repo, self.get_repository_info, repo)}
+                if results["repo_info"]:
+                    results.update({key: self._timed_task(repo, func, *args)
+                                    for key, (func, args) in self._repo_tasks(repo).items() if key != "repo_info"})
+                repo_data = self._build_row(repo, results)
+            except Exception as e:
+                self._record_failure(repo, str(e))
+                continue
+            self._checkpoint(repo, results, repo_data)
+            if repo_data is not None: all_data.append(repo_data)
+        return all_data
+
+    def _collect_concurrent(self, repositories: List[str]) -> List[Dict]:
+        # Every endpoint call of every repo goes into one shared pool; rows are
+        # assembled afterwards in configuration order so output stays stable.
+        all_data = []
+        self.logger.info(f"Fetching {len(repositories)} repositories with {self.max_workers} workers")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="github") as pool:
+            futures = [
+                (repo, {key: pool.submit(self._timed_task, repo, func, *args)
+                        for key, (func, args) in self._repo_tasks(repo).items()})
+                for repo in repositories
+            ]
+            for repo, repo_futures in futures:
+                try:
+                    results = {key: future.result() for key, future in repo_futures.items()}
+                    repo_data = self._build_row(repo, results)
+                except Exception as e:
+                    self._record_failure(repo, str(e))
+                    continue
+                self._checkpoint(repo, results, repo_data)
+                if repo_data is not None: all_data.append(repo_data)
+        return all_data
+
+    def _begin_collection(self) -> List[str]:
+        # Returns the repositories still to fetch; with --resume that excludes
+        # everything already checkpointed in today's journal.
+        self.failed_repositories = {}
+        if not self.journal_dir: return list(self.repositories)
+        self.journal = FetchJournal(Path(self.journal_dir), resume=self.resume)
+        done = self.journal.completed()
+        if done:
+            self.logger.info(f"Resuming from {self.journal.path}: {len(done)} repositories already fetched today")
+        return [repo for repo in self.repositories if repo not in done]
+
+    def _finish_collection(self, all_data: List[Dict]) -> pd.DataFrame:
+        if self.cache: self.cache.log_stats()
+        if self.sync_state: self.sync_state.save()
+        if self.journal:
+            # The journal holds rows from this run and any resumed earlier run.
+            all_data = self.journal.rows(self.repositories)
+        if self.failed_repositories:
+            hint = " - rerun with --resume to retry them" if self.journal else ""
+            self.logger.warning(f"{len(self.failed_repositories)} of {len(self.repositories)} repositories failed: "
+                                f"{', '.join(self.failed_repositories)}{hint}")
+        return build_repository_frame(all_data)
+
+    def collect_all_data(self) -> pd.DataFrame:
+        repositories = self._begin_collection()
+        try:
+            if self.max_workers > 1:
+                all_data = self._collect_concurrent(repositories)
+            else:
+                all_data = self._collect_serial(repositories)
+        finally:
+            if self.journal: self.journal.close()
+        return self._finish_collection(all_data)
+
+def create_client(config: Dict, full_resync: bool = False, resume: bool = False) -> GitHubAPIClient:
+    if config["github"].get("client", "rest") == "graphql":
+        from github_graphql import GitHubGraphQLClient
+        return GitHubGraphQLClient(config, full_resync=full_resync, resume=resume)
+    return GitHubAPIClient(config, full_resync=full_resync, resume=resume)
 
-def fetch_github_data(config_path: str) -> pd.DataFrame:
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+def fetch_github_data(config: Union[str, Dict], full_resync: bool = False) -> pd.DataFrame:
+    # Callers that already hold the parsed config can pass it instead of a path.
+    if not isinstance(config, dict):
+        with open(config, 'r') as f:
+            config = json.load(f)
     logging.basicConfig(
         level=getattr(logging, config["logging"]["level"]),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    client = GitHubAPIClient(config)
-    return client.collect_all_data()
+    return create_client(config, full_resync=full_resync).collect_all_data()
@@ -0,0 +1,117 @@
+"""
+GitHub GraphQL client for the IT Dashboard
+Fetches many repositories per request using aliased repository queries
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+from github_api import GitHubAPIClient
+from run_metrics import run_metrics
+
+REPOSITORY_FIELDS = """
+    stargazerCount
+    forkCount
+    primaryLanguage { name }
+    diskUsage
+    createdAt
+    updatedAt
+    openIssues: issues(states: OPEN) { totalCount }
+    closedIssues: issues(states: CLOSED) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    closedPullRequests: pullRequests(states: [CLOSED, MERGED]) { totalCount }
+"""
+
+class GitHubGraphQLClient(GitHubAPIClient):
+    def __init__(self, config: Dict, full_resync: bool = False, resume: bool = False):
+        super().__init__(config, full_resync=full_resync, resume=resume)
+        self.graphql_url = config["github"].get("graphql_url", f"{self.base_url}/graphql")
+        self.batch_size = max(1, config["github"].get("graphql_batch_size", 25))
+        # Totals come straight from GraphQL, which has no item stream for
+        # lifecycle analytics and no per-item delta sync.
+        if self.lifecycle_enabled:
+            self.logger.warning("Lifecycle analytics are not supported by the GraphQL client and will be skipped")
+            self.lifecycle_enabled = False
+        if config["github"].get("metrics_mode", "full") == "incremental":
+            self.logger.warning("metrics_mode 'incremental' is not supported by the GraphQL client - "
+                                "fetching totals instead")
+            # Leave the REST client's sync state untouched on disk.
+            self.sync_state = None
+
+    @staticmethod
+    def build_query(repos: List[str]) -> Dict:
+        declarations, selections, variables = [], [], {}
+        for i, repo in enumerate(repos):
+            owner, name = repo.split("/", 1)
+            declarations.append(f"$owner{i}: String!, $name{i}: String!")
+            selections.append(f"r{i}: repository(owner: $owner{i}, name: $name{i}) {{{REPOSITORY_FIELDS}}}")
+            variables[f"owner{i}"], variables[f"name{i}"] = owner, name
+        query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+        return {"query": query, "variables": variables}
+
+    def fetch_batch(self, repos: List[str]) -> Dict[str, Optional[Dict]]:
+        self.logger.info(f"Fetching GraphQL batch of {len(repos)} repositories ({repos[0]} ...)")
+        response = self._request(self.graphql_url, json_body=self.build_query(repos))
+        if response is None: return {repo: None for repo in repos}
+        run_metrics.increment("pages_fetched")
+        payload = response.json()
+        for error in payload.get("errors", []):
+            self.logger.error(f"GraphQL error: {error.get('message', error)}")
+        data = payload.get("data") or {}
+        return {repo: data.get(f"r{i}") for i, repo in enumerate(repos)}
+
+    def _build_graphql_row(self, repo: str, node: Dict) -> Dict:
+        open_prs = node["openPullRequests"]["totalCount"]
+        closed_prs = node["closedPullRequests"]["totalCount"]
+        open_issues = node["openIssues"]["totalCount"]
+        closed_issues = node["closedIssues"]["totalCount"]
+        return {
+            "repository": repo,
+            "stars": node.get("stargazerCount", 0),
+            "forks": node.get("forkCount", 0),
+            # REST's watchers_count mirrors the stargazer count, keep the same meaning.
+            "watchers": node.get("stargazerCount", 0),
+            "open_prs": open_prs,
+            "closed_prs": closed_prs,
+            "open_issues": open_issues,
+            "closed_issues": closed_issues,
+            "total_prs": open_prs + closed_prs,
+            "total_issues": open_issues + closed_issues,
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "size_kb": node.get("diskUsage", 0),
+            "created_at": node.get("createdAt", ""),
+            "updated_at": node.get("updatedAt", ""),
+            "fetch_timestamp": datetime.now().isoformat()
+        }
+
+    def collect_all_data(self) -> pd.DataFrame:
+        repositories = self._begin_collection()
+        batches = [repositories[i:i + self.batch_size]
+                   for i in range(0, len(repositories), self.batch_size)]
+        all_data = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="graphql") as pool:
+                futures = [(batch, pool.submit(self.fetch_batch, batch)) for batch in batches]
+                for batch, future in futures:
+                    try:
+                        batch_result = future.result()
+                    except Exception as e:
+                        for repo in batch:
+                            self._record_failure(repo, str(e))
+                        continue
+                    for repo, node in batch_result.items():
+                        if not node:
+                            self._record_failure(repo, "no GraphQL data returned")
+                            continue
+                        # Partial responses can null out nested connections
+                        # (e.g. on access errors) for just this repository.
+                        try:
+                            repo_data = self._build_graphql_row(repo, node)
+                        except (KeyError, TypeError) as e:
+                            self._record_failure(repo, f"incomplete GraphQL data: {e!r}")
+                            continue
+                        self._checkpoint(repo, {"repo_info": node}, repo_data)
+                        all_data.append(repo_data)
+        finally:
+            if self.journal: self.journal.close()
+        return self._finish_collection(all_data)
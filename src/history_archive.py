@@ -0,0 +1,98 @@
+"""
+Historical metrics archive for the IT Dashboard
+Appends every run to a date-partitioned Parquet archive and keeps daily,
+weekly and monthly rollups up to date for trend reporting
+"""
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+TREND_METRICS = ["stars", "forks", "open_issues", "open_prs"]
+ROLLUP_PERIODS = {"daily": "D", "weekly": "W", "monthly": "M"}
+
+class HistoryArchive:
+    def __init__(self, archive_dir: str):
+        self.archive_dir = Path(archive_dir)
+        self.snapshots_dir = self.archive_dir / "snapshots"
+        self.rollups_dir = self.archive_dir / "rollups"
+        self.logger = logging.getLogger(__name__)
+
+    def append(self, data: pd.DataFrame, run_time: Optional[datetime] = None) -> Path:
+        run_time = run_time or datetime.now()
+        metrics = [column for column in TREND_METRICS if column in data.columns]
+        snapshot = data[["repository"] + metrics].copy()
+        snapshot["run_time"] = pd.Timestamp(run_time)
+        partition = self.snapshots_dir / f"date={run_time:%Y-%m-%d}"
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"run-{run_time:%H%M%S%f}.parquet"
+        pq.write_table(pa.Table.from_pandas(snapshot, preserve_index=False), path)
+        for period in ROLLUP_PERIODS:
+            self._update_rollup(period, snapshot)
+        self.logger.info(f"✓ Archived metrics for {len(snapshot)} repositories: {path}")
+        return path
+
+    def _rollup_path(self, period: str) -> Path:
+        return self.rollups_dir / f"{period}.parquet"
+
+    def _update_rollup(self, period: str, snapshot: pd.DataFrame) -> None:
+        # Each rollup row holds the latest values seen for a repository within
+        # a period, so a new run only replaces the rows of its own period.
+        rows = snapshot.drop(columns="run_time")
+        rows.insert(0, "period_start", snapshot["run_time"].dt.to_period(ROLLUP_PERIODS[period]).dt.start_time)
+        rollup = self.load_rollup(period)
+        if not rollup.empty:
+            keys = pd.MultiIndex.from_frame(rows[["period_start", "repository"]])
+            stale = pd.MultiIndex.from_frame(rollup[["period_start", "repository"]]).isin(keys)
+            rows = pd.concat([rollup[~stale], rows], ignore_index=True)
+        rows = rows.sort_values(["period_start", "repository"], ignore_index=True)
+        self.rollups_dir.mkdir(parents=True, exist_ok=True)
+        path = self._rollup_path(period)
+        temp_path = path.with_suffix(".tmp")
+        pq.write_table(pa.Table.from_pandas(rows, preserve_index=False), temp_path)
+        os.replace(temp_path, path)
+
+    def load_rollup(self, period: str) -> pd.DataFrame:
+        path = self._rollup_path(period)
+        if not path.exists(): return pd.DataFrame()
+        return pq.read_table(path, memory_map=True).to_pandas()
+
+    def load_history(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        if not self.snapshots_dir.exists(): return pd.DataFrame()
+        dataset = ds.dataset(self.snapshots_dir, format="parquet", partitioning="hive",
+                             filesystem=fs.LocalFileSystem(use_mmap=True))
+        condition = None
+        if start is not None:
+            condition = ds.field("run_time") >= pa.scalar(pd.Timestamp(start), type=pa.timestamp("ns"))
+        if end is not None:
+            upper = ds.field("run_time") < pa.scalar(pd.Timestamp(end), type=pa.timestamp("ns"))
+            condition = upper if condition is None else condition & upper
+        columns = [name for name in dataset.schema.names if name != "date"]
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    def trends(self, period: str = "weekly", periods: int = 52,
+               repositories: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        rollup = self.load_rollup(period)
+        # Archives can be shared between dashboards and outlive config changes,
+        # so trends only cover the repositories the caller asks for.
+        if repositories is not None and not rollup.empty:
+            rollup = rollup[rollup["repository"].isin(list(repositories))]
+        if rollup.empty: return rollup
+        metrics = [column for column in TREND_METRICS if column in rollup.columns]
+        rollup = rollup.sort_values(["repository", "period_start"])
+        # Deltas are taken per repository, so repos joining or leaving the
+        # configuration do not show up as jumps in the totals.
+        deltas = rollup.groupby("repository", observed=True)[metrics].diff().fillna(0)
+        deltas.columns = [f"{column}_delta" for column in metrics]
+        deltas["period_start"] = rollup["period_start"]
+        deltas["repositories"] = 1
+        trend = deltas.groupby("period_start", as_index=False).sum().tail(periods)
+        trend[deltas.columns[:len(metrics)]] = trend[deltas.columns[:len(metrics)]].astype("int64")
+        trend["period_start"] = trend["period_start"].dt.date
+        return trend[["period_start", "repositories"] + list(deltas.columns[:len(metrics)])].reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""
+On-disk HTTP response cache for the GitHub API client
+Stores validators (ETag / Last-Modified) so unchanged pages revalidate with a 304
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+
+class ResponseCache:
+    KEPT_HEADERS = ("ETag", "Last-Modified", "Link", "Content-Type")
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 256):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._sizes = {path.name: path.stat().st_size for path in self.cache_dir.glob("*.json")}
+        self._total_size = sum(self._sizes.values())
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def _path(self, url: str, params: Optional[Dict]) -> Path:
+        key = json.dumps([url, sorted((params or {}).items())], default=str)
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def lookup(self, url: str, params: Optional[Dict]) -> Optional[Dict]:
+        path = self._path(url, params)
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        if not entry: return {}
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def hit(self, url: str, params: Optional[Dict], entry: Dict) -> requests.Response:
+        path = self._path(url, params)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.stats["hits"] += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        return response
+
+    def miss(self, url: str, params: Optional[Dict], response: requests.Response) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
+        headers = {name: response.headers[name] for name in self.KEPT_HEADERS if name in response.headers}
+        if not (headers.get("ETag") or headers.get("Last-Modified")): return
+        path = self._path(url, params)
+        payload = json.dumps({"url": response.url, "headers": headers, "body": response.text})
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._total_size += len(payload) - self._sizes.get(path.name, 0)
+            self._sizes[path.name] = len(payload)
+            self.stats["stored"] += 1
+            if self._total_size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Least recently used first: hits refresh the file's mtime.
+        target = int(self.max_size * 0.9)
+        entries = []
+        for name in self._sizes:
+            try:
+                entries.append(((self.cache_dir / name).stat().st_mtime, name))
+            except FileNotFoundError:
+                entries.append((0.0, name))
+        for _, name in sorted(entries):
+            if self._total_size <= target: break
+            try:
+                (self.cache_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+            self._total_size -= self._sizes.pop(name)
+            self.stats["evicted"] += 1
+
+    def log_stats(self) -> None:
+        total = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / total * 100 if total else 0.0
+        self.logger.info(
+            f"HTTP cache: {self.stats['hits']} hits, {self.stats['misses']} misses ({hit_rate:.1f}% hit rate), "
+            f"{self.stats['stored']} stored, {self.stats['evicted']} evicted, "
+            f"{self._total_size / (1024 * 1024):.1f} MB on disk"
+        )
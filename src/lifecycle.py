@@ -0,0 +1,102 @@
+"""
+Pull request and issue lifecycle analytics for the IT Dashboard
+Collects compact timestamp columns while streaming and computes vectorized metrics
+"""
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+LIFECYCLE_COLUMNS = [
+    "merged_prs", "median_merge_hours", "p90_merge_hours",
+    "median_open_age_days", "p90_open_age_days", "open_over_90_days",
+    "weekly_throughput", "unique_authors", "top_label",
+]
+
+TIMESTAMP_FIELDS = {"created": "created_at", "closed": "closed_at", "merged": "merged_at"}
+# One GitHub listing page; timestamps are parsed a page at a time.
+PARSE_BATCH = 100
+EPOCH = pd.Timestamp(0, tz="UTC")
+
+def _epochs(timestamps: List[Optional[str]]) -> np.ndarray:
+    # Parses a batch of GitHub "...Z" timestamps in one call; missing values
+    # become NaN. fromisoformat only accepts the Z suffix from Python 3.11.
+    parsed = pd.DatetimeIndex(pd.to_datetime([value or None for value in timestamps], utc=True, format="ISO8601"))
+    return ((parsed - EPOCH) / pd.Timedelta(seconds=1)).to_numpy(dtype=np.float64, na_value=np.nan)
+
+class LifecycleAggregator:
+    # Timestamps are kept as float64 epoch seconds in typed arrays and authors
+    # as integer codes, so 100k items cost a few MB instead of 100k dicts.
+    __slots__ = ("created", "closed", "merged", "pending", "author_codes", "authors", "labels")
+
+    def __init__(self):
+        self.created = array('d')
+        self.closed = array('d')
+        self.merged = array('d')
+        self.pending: Dict[str, List[Optional[str]]] = {column: [] for column in TIMESTAMP_FIELDS}
+        self.author_codes = array('q')
+        self.authors: Dict[str, int] = {}
+        self.labels = Counter()
+
+    def _flush(self) -> None:
+        for column, timestamps in self.pending.items():
+            if timestamps:
+                getattr(self, column).frombytes(_epochs(timestamps).tobytes())
+                timestamps.clear()
+
+    def update(self, item: Dict) -> None:
+        for column, field in TIMESTAMP_FIELDS.items():
+            self.pending[column].append(item.get(field))
+        if len(self.pending["created"]) >= PARSE_BATCH:
+            self._flush()
+        login = (item.get("user") or {}).get("login", "")
+        self.author_codes.append(self.authors.setdefault(login, len(self.authors)))
+        self.labels.update(label["name"] for label in item.get("labels", []))
+
+    def result(self) -> "LifecycleAggregator":
+        return self
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        self._flush()
+        return {
+            "created": np.frombuffer(self.created, dtype=np.float64),
+            "closed": np.frombuffer(self.closed, dtype=np.float64),
+            "merged": np.frombuffer(self.merged, dtype=np.float64),
+            "author": np.frombuffer(self.author_codes, dtype=np.int64),
+        }
+
+def _percentile(values: np.ndarray, q: float) -> float:
+    return round(float(np.percentile(values, q)), 2) if values.size else np.nan
+
+def compute_lifecycle_metrics(aggregators: Dict[str, LifecycleAggregator], throughput_weeks: int = 12,
+                              now: Optional[float] = None) -> Dict:
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    closed_prs = aggregators["closed_prs"].columns()
+    merged_mask = ~np.isnan(closed_prs["merged"])
+    merge_hours = (closed_prs["merged"][merged_mask] - closed_prs["created"][merged_mask]) / 3600
+    open_created = np.concatenate([aggregators["open_prs"].columns()["created"],
+                                   aggregators["open_issues"].columns()["created"]])
+    open_age_days = (now - open_created[~np.isnan(open_created)]) / 86400
+    # Throughput counts merged PRs and closed issues inside the trailing window.
+    finished = np.concatenate([closed_prs["merged"][merged_mask], aggregators["closed_issues"].columns()["closed"]])
+    window_start = now - throughput_weeks * 7 * 86400
+    recent = np.count_nonzero((finished >= window_start) & (finished <= now))
+    authors = set()
+    labels = Counter()
+    for aggregator in aggregators.values():
+        authors.update(aggregator.authors)
+        labels.update(aggregator.labels)
+    authors.discard("")
+    return {
+        "merged_prs": int(merged_mask.sum()),
+        "median_merge_hours": _percentile(merge_hours, 50),
+        "p90_merge_hours": _percentile(merge_hours, 90),
+        "median_open_age_days": _percentile(open_age_days, 50),
+        "p90_open_age_days": _percentile(open_age_days, 90),
+        "open_over_90_days": int(np.count_nonzero(open_age_days > 90)),
+        "weekly_throughput": round(float(recent) / throughput_weeks, 2) if throughput_weeks else np.nan,
+        "unique_authors": len(authors),
+        "top_label": labels.most_common(1)[0][0] if labels else "",
+    }
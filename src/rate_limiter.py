@@ -0,0 +1,85 @@
+"""
+Header-driven rate limiter for the GitHub API client
+Tracks X-RateLimit-* / Retry-After and paces every worker sharing the client
+"""
+import logging
+import random
+import threading
+import time
+from typing import Mapping, Optional
+
+class RateLimiter:
+    def __init__(self, min_interval: float = 0.0, base_backoff: float = 1.0, max_backoff: float = 300.0,
+                 rate_limit_floor: float = 60.0):
+        self.min_interval = min_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.rate_limit_floor = rate_limit_floor
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._blocked_until = 0.0
+        self.total_wait = 0.0
+
+    def acquire(self) -> float:
+        # Requests go out back to back while the window has quota; once the
+        # local estimate reaches zero every caller waits for the reset.
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at, self._blocked_until)
+            if self.remaining is not None and self.remaining <= 0 and self.reset_at:
+                start_at = max(start_at, now + self.reset_at - time.time())
+            if self.remaining is not None:
+                self.remaining -= 1
+            self._next_request_at = start_at + self.min_interval
+            wait = start_at - now
+            self.total_wait += wait
+        if wait > 0:
+            if wait >= 1:
+                self.logger.info(f"Rate limiter waiting {wait:.1f}s")
+            time.sleep(wait)
+        return wait
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        remaining, reset = headers.get("X-RateLimit-Remaining"), headers.get("X-RateLimit-Reset")
+        if remaining is None: return
+        try:
+            remaining, reset_at = int(remaining), float(reset) if reset is not None else None
+        except ValueError:
+            return
+        with self._lock:
+            if reset_at is not None and self.reset_at is not None and reset_at < self.reset_at: return
+            # Concurrent responses arrive out of order, so within one window keep the lowest count.
+            if reset_at == self.reset_at and self.remaining is not None:
+                self.remaining = min(self.remaining, remaining)
+            else:
+                self.remaining = remaining
+            self.reset_at = reset_at
+
+    @staticmethod
+    def is_rate_limited(status_code: int, headers: Mapping[str, str], body: str = "") -> bool:
+        if status_code == 429: return True
+        if status_code != 403: return False
+        return (headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers
+                or "rate limit" in body.lower())
+
+    def backoff(self, attempt: int, headers: Optional[Mapping[str, str]] = None, block_all: bool = False) -> float:
+        headers = headers or {}
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            delay = float(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+            delay = max(float(headers["X-RateLimit-Reset"]) - time.time(), 0.0) + 1
+        else:
+            # Full jitter keeps concurrent workers from retrying in lockstep.
+            delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+            if block_all:
+                # block_all marks a rate-limited response. Without reset information
+                # (a secondary limit) GitHub asks clients to wait at least a minute.
+                delay += self.rate_limit_floor
+        if block_all:
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
@@ -0,0 +1,42 @@
+"""
+Typed repository DataFrame for the IT Dashboard
+Turns collected repository rows into compact dtypes and derives the
+owner/name columns shared by charts and sheets
+"""
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ["owner", "name", "language"]
+DATETIME_COLUMNS = ["created_at", "updated_at"]
+INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+def compact_repository_frame(data: pd.DataFrame) -> pd.DataFrame:
+    if data.empty or "repository" not in data.columns: return data
+    data = data.copy()
+    if "name" not in data.columns:
+        # Split once here instead of in every chart that needs short labels.
+        parts = data["repository"].str.split("/", n=1, expand=True)
+        position = data.columns.get_loc("repository") + 1
+        data.insert(position, "owner", parts[0])
+        data.insert(position + 1, "name", parts[1])
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns:
+            data[column] = data[column].astype("category")
+    # GitHub timestamps are UTC; openpyxl cannot write tz-aware values, so
+    # they are kept as naive UTC datetimes.
+    for column in DATETIME_COLUMNS:
+        if column in data.columns and not pd.api.types.is_datetime64_any_dtype(data[column]):
+            data[column] = pd.to_datetime(data[column].replace("", None), utc=True).dt.tz_localize(None)
+    if "fetch_timestamp" in data.columns and not pd.api.types.is_datetime64_any_dtype(data["fetch_timestamp"]):
+        data["fetch_timestamp"] = pd.to_datetime(data["fetch_timestamp"])
+    # int32 rather than the smallest fitting type, so sums of two counts
+    # (e.g. issues + PRs for chart ranking) cannot overflow.
+    for column in data.select_dtypes(include="integer").columns:
+        values = data[column]
+        if values.min() >= INT32_RANGE[0] and values.max() <= INT32_RANGE[1]:
+            data[column] = values.astype(np.int32)
+    return data
+
+def build_repository_frame(rows: List[Dict]) -> pd.DataFrame:
+    return compact_repository_frame(pd.DataFrame(rows))
@@ -0,0 +1,96 @@
+"""
+Run instrumentation for the IT Dashboard Generator
+Collects stage timings, HTTP counters and resource usage into a JSON run report
+"""
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.stages: Dict[str, float] = defaultdict(float)
+            self.repositories: Dict[str, float] = defaultdict(float)
+            self.charts: Dict[str, float] = {}
+            self.counters: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] += time.perf_counter() - start
+
+    def increment(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def add_repository_time(self, repo: str, seconds: float) -> None:
+        with self._lock:
+            self.repositories[repo] += seconds
+
+    def record_chart(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.charts[name] = seconds
+
+    @staticmethod
+    def peak_rss_mb() -> Optional[Dict[str, float]]:
+        if resource is None: return None
+        # ru_maxrss is KB on Linux and bytes on macOS.
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {
+            "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+            "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+        }
+
+    def to_dict(self, status: str = "success", message: str = "") -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            slowest = sorted(self.repositories.items(), key=lambda item: item[1], reverse=True)
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "started_at": self.started_at.isoformat(),
+                "status": status,
+                "message": message,
+                "wall_seconds": round(time.perf_counter() - self._start, 3),
+                "stages": {name: round(seconds, 3) for name, seconds in self.stages.items()},
+                "http": {
+                    "requests": int(counters.get("http_requests", 0)),
+                    "bytes": int(counters.get("http_bytes", 0)),
+                    "pages": int(counters.get("pages_fetched", 0)),
+                    "not_modified": int(counters.get("http_not_modified", 0)),
+                    "retries": int(counters.get("retries", 0)),
+                    "rate_limit_wait_seconds": round(counters.get("rate_limit_wait_seconds", 0.0), 3),
+                },
+                "charts": {name: round(seconds, 3) for name, seconds in self.charts.items()},
+                "repositories": {repo: round(seconds, 3) for repo, seconds in slowest},
+                "peak_rss_mb": self.peak_rss_mb(),
+            }
+
+    def write(self, output_dir: Path, status: str = "success", message: str = "") -> Path:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report_file = output_dir / "last_run_report.json"
+        with open(report_file, 'w') as f:
+            json.dump(self.to_dict(status, message), f, indent=2)
+        return report_file
+
+run_metrics = RunMetrics()
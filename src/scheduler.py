@@ -0,0 +1,60 @@
+"""
+Resident scheduler for the IT Dashboard Generator
+Keeps one warm process and fires dashboard runs on the configured schedule
+"""
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from utils import get_next_run_time
+
+class DashboardDaemon:
+    def __init__(self, config: Dict, run_once: Callable[[], None]):
+        scheduling = config.get("scheduling", {})
+        self.daily_time = scheduling.get("daily_time")
+        self.timezone = scheduling.get("timezone")
+        interval = scheduling.get("refresh_interval_minutes")
+        self.refresh_interval = timedelta(minutes=interval) if interval else None
+        self.run_on_start = scheduling.get("run_on_start", False)
+        self.run_once = run_once
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._last_run: Optional[datetime] = None
+
+    def stop(self, signum=None, frame=None) -> None:
+        if signum is not None:
+            self.logger.info(f"Received signal {signum}, shutting down after the current run")
+        self._stop.set()
+
+    def next_run_time(self) -> datetime:
+        candidates = []
+        if self.daily_time:
+            candidates.append(get_next_run_time(self.daily_time, self.timezone))
+        if self.refresh_interval:
+            candidates.append((self._last_run or datetime.now()) + self.refresh_interval)
+        if not candidates:
+            raise ValueError("Daemon mode needs scheduling.daily_time or scheduling.refresh_interval_minutes")
+        return min(candidates)
+
+    def run_forever(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.logger.info("Dashboard daemon started")
+        if self.run_on_start:
+            self._run()
+        while not self._stop.is_set():
+            next_run = self.next_run_time()
+            self.logger.info(f"Next dashboard run scheduled for {next_run}")
+            # Event.wait returns early on SIGTERM, so shutdown never waits for the schedule.
+            if self._stop.wait(max((next_run - datetime.now()).total_seconds(), 0)):
+                break
+            self._run()
+        self.logger.info("Dashboard daemon stopped")
+
+    def _run(self) -> None:
+        self._last_run = datetime.now()
+        try:
+            self.run_once()
+        except Exception as e:
+            self.logger.error(f"Scheduled dashboard run failed: {e}")
@@ -0,0 +1,39 @@
+"""
+DataFrame snapshots for split fetch / render runs
+Writes fetched repository data to Feather or Parquet
+"""
+import logging
+from pathlib import Path
+import pandas as pd
+from repository_frame import compact_repository_frame
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMATS = (".feather", ".parquet")
+
+def _check_format(path: Path) -> None:
+    if path.suffix not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unsupported snapshot format '{path.suffix}', use {' or '.join(SNAPSHOT_FORMATS)}")
+
+def save_snapshot(data: pd.DataFrame, path: Path) -> Path:
+    path = Path(path)
+    _check_format(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".feather":
+        data.reset_index(drop=True).to_feather(path)
+    else:
+        data.to_parquet(path, index=False)
+    logger.info(f"✓ Snapshot of {len(data)} repositories saved: {path}")
+    return path
+
+def load_snapshot(path: Path) -> pd.DataFrame:
+    path = Path(path)
+    _check_format(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Snapshot not found: {path}")
+    if path.suffix == ".feather":
+        data = pd.read_feather(path)
+    else:
+        data = pd.read_parquet(path)
+    # Older snapshots predate the typed frame; compacting a typed one is a no-op.
+    return compact_repository_frame(data)
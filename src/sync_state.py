@@ -0,0 +1,70 @@
+"""
+Local per-repository state for incremental GitHub syncs
+Keeps last sync time, closed totals and open item numbers between runs
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+class SyncStateStore:
+    def __init__(self, state_file: Path):
+        self.state_file = Path(state_file)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = {}
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    self._state = json.load(f)
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"Ignoring unreadable sync state {self.state_file}: {e}")
+
+    def get(self, repo: str) -> Optional[Dict]:
+        with self._lock:
+            state = self._state.get(repo)
+            if state is None: return None
+            return {**state, "open_prs": set(state["open_prs"]), "open_issues": set(state["open_issues"])}
+
+    def put(self, repo: str, state: Dict) -> None:
+        with self._lock:
+            self._state[repo] = {**state, "open_prs": sorted(state["open_prs"]),
+                                 "open_issues": sorted(state["open_issues"])}
+
+    def clear(self, repos: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            if repos is None:
+                self._state = {}
+            else:
+                for repo in repos:
+                    self._state.pop(repo, None)
+
+    def save(self) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._state, f)
+        os.replace(tmp_path, self.state_file)
+
+def apply_item_delta(state: Dict, item: Dict, last_sync: str) -> None:
+    # Only items updated since last_sync are seen, so state transitions are
+    # inferred from membership in the stored open set and the creation time.
+    is_pr = "pull_request" in item
+    open_ids = state["open_prs"] if is_pr else state["open_issues"]
+    closed_key = "closed_prs" if is_pr else "closed_issues"
+    number = item["number"]
+    was_open = number in open_ids
+    is_new = item.get("created_at", "") > last_sync
+    if item.get("state") == "open":
+        if not was_open:
+            open_ids.add(number)
+            if not is_new:
+                state[closed_key] = max(state[closed_key] - 1, 0)
+    elif was_open:
+        open_ids.discard(number)
+        state[closed_key] += 1
+    elif is_new:
+        state[closed_key] += 1
@@ -4,9 +4,11 @@ Utility functions for IT Dashboard Generator
 import json
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
 import os
+import shutil
 
 def load_config(config_path: str) -> Dict:
     try:
@@ -31,6 +33,13 @@ def cleanup_old_files(directory: Path, max_files: int, pattern: str = "*") -> No
     except Exception as e:
         logging.warning(f"Error cleaning up files in {directory}: {e}")
 
+def link_or_copy(source: Path, destination: Path) -> None:
+    # Hardlinks share one copy on disk; copy when the filesystem can't link.
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
 def validate_repositories(repositories: List[str]) -> List[str]:
     valid_repos = []
     for repo in repositories:
@@ -47,16 +56,46 @@ def format_file_size(size_bytes: int) -> str:
         size_bytes /= 1024.0
     return f"{size_bytes:.1f} TB"
 
-def get_next_run_time(schedule_time: str) -> datetime:
+def get_next_run_time(schedule_time: str, timezone: Optional[str] = None) -> datetime:
+    # schedule_time is read in the given timezone (local time when None); the
+    # result is naive local time so it compares directly with datetime.now().
     try:
         hour, minute = map(int, schedule_time.split(':'))
+        run_at = time(hour, minute)
+    except ValueError:
+        raise ValueError(f"Invalid schedule time format: {schedule_time}. Use HH:MM format.")
+    if timezone is None:
         now = datetime.now()
-        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        next_run = datetime.combine(now.date(), run_at)
         if next_run <= now:
             next_run += timedelta(days=1)
         return next_run
-    except ValueError:
-        raise ValueError(f"Invalid schedule time format: {schedule_time}. Use HH:MM format.")
+    tz = ZoneInfo(timezone)
+    now = datetime.now(tz)
+    next_run = datetime.combine(now.date(), run_at, tzinfo=tz)
+    if next_run <= now:
+        next_run = datetime.combine(now.date() + timedelta(days=1), run_at, tzinfo=tz)
+    return next_run.astimezone().replace(tzinfo=None)
+
+class DailyLogFileHandler(logging.FileHandler):
+    # Switches to a new {date} log file when the day changes, so a long-running
+    # process keeps one file per day like separate daily runs do.
+    def __init__(self, log_dir: Path, log_file: str):
+        self.log_dir = Path(log_dir)
+        self.log_file = log_file
+        self._date = datetime.now().strftime("%Y%m%d")
+        super().__init__(self.log_dir / log_file.format(date=self._date))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        date = datetime.now().strftime("%Y%m%d")
+        if date != self._date:
+            # emit runs under the handler lock, so swapping the stream is safe.
+            self._date = date
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(self.log_dir / self.log_file.format(date=date))
+        super().emit(record)
 
 def create_status_file(status: str, message: str, output_dir: Path) -> None:
     status_data = {
@@ -0,0 +1,63 @@
+"""
+Tests for artifact retention in the content-addressed artifact store
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from artifact_store import ArtifactStore
+
+def _chart_run(store: ArtifactStore, charts_dir: Path, content: bytes, created: datetime) -> str:
+    charts_dir.mkdir(parents=True)
+    chart = charts_dir / "stars.png"
+    chart.write_bytes(content)
+    digest = store.put(chart)
+    store.register(charts_dir, "charts", [digest], created=created)
+    return digest
+
+def test_retention_is_scoped_by_kind_and_directory(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    start = datetime(2026, 1, 1)
+    for team in ("team_a", "team_b"):
+        for day in range(3):
+            report = tmp_path / team / f"report_{day}.xlsx"
+            report.parent.mkdir(exist_ok=True)
+            report.write_bytes(b"xlsx")
+            store.register(report, "reports", created=start + timedelta(days=day))
+    removed = store.enforce_retention({("reports", str(tmp_path / "team_a")): 1})
+    assert removed == 2
+    assert sorted(path.name for path in (tmp_path / "team_a").iterdir()) == ["report_2.xlsx"]
+    # No policy for team_b's directory, so none of its reports are touched.
+    assert len(list((tmp_path / "team_b").iterdir())) == 3
+
+def test_unreferenced_objects_are_dropped(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    charts = tmp_path / "reports" / "charts"
+    start = datetime(2026, 1, 1)
+    old_digest = _chart_run(store, charts / "run1", b"old chart", start)
+    shared_digest = _chart_run(store, charts / "run2", b"same chart", start + timedelta(days=1))
+    _chart_run(store, charts / "run3", b"same chart", start + timedelta(days=2))
+    objects = {path.stem for path in store.objects_dir.rglob("*.png")}
+    assert objects == {old_digest, shared_digest}
+
+    removed = store.enforce_retention({("charts", str(charts)): 1})
+    assert removed == 2
+    assert sorted(path.name for path in charts.iterdir()) == ["run3"]
+    # run3 still references the shared image; the old one has no references left.
+    assert {path.stem for path in store.objects_dir.rglob("*.png")} == {shared_digest}
+    assert (charts / "run3" / "stars.png").read_bytes() == b"same chart"
+
+def test_reregistered_path_keeps_latest_timestamp(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    cache_dir = tmp_path / "chart_cache"
+    cache_dir.mkdir()
+    start = datetime(2026, 1, 1)
+    for name, day in (("a.png", 0), ("b.png", 1)):
+        (cache_dir / name).write_bytes(name.encode())
+        store.register(cache_dir / name, "chart_cache", created=start + timedelta(days=day))
+    # Reusing a.png later makes it the most recently used entry.
+    store.register(cache_dir / "a.png", "chart_cache", created=start + timedelta(days=2))
+    store.enforce_retention({("chart_cache", str(cache_dir)): 1})
+    assert [path.name for path in cache_dir.iterdir()] == ["a.png"]
+    assert len(store.index_file.read_text().splitlines()) == 1
@@ -0,0 +1,83 @@
+"""
+Tests for incremental sync state transitions and the sync baseline
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from github_api import GitHubAPIClient
+from sync_state import SyncStateStore, apply_item_delta
+
+LAST_SYNC = "2026-01-10T00:00:00Z"
+OLD = "2026-01-01T00:00:00Z"
+NEW = "2026-01-12T00:00:00Z"
+
+def _state() -> dict:
+    return {"open_prs": {1}, "open_issues": {10}, "closed_prs": 5, "closed_issues": 7, "last_sync": LAST_SYNC}
+
+def _issue(number: int, state: str, created_at: str) -> dict:
+    return {"number": number, "state": state, "created_at": created_at}
+
+def _pull(number: int, state: str, created_at: str) -> dict:
+    return {**_issue(number, state, created_at), "pull_request": {}}
+
+def test_open_item_closed_since_last_sync():
+    state = _state()
+    apply_item_delta(state, _pull(1, "closed", OLD), LAST_SYNC)
+    assert state["open_prs"] == set()
+    assert state["closed_prs"] == 6
+    assert state["closed_issues"] == 7
+
+def test_closed_item_reopened():
+    state = _state()
+    apply_item_delta(state, _issue(11, "open", OLD), LAST_SYNC)
+    assert state["open_issues"] == {10, 11}
+    assert state["closed_issues"] == 6
+
+def test_item_created_and_closed_since_last_sync():
+    state = _state()
+    apply_item_delta(state, _issue(12, "closed", NEW), LAST_SYNC)
+    assert state["open_issues"] == {10}
+    assert state["closed_issues"] == 8
+
+def test_item_created_open_since_last_sync():
+    state = _state()
+    apply_item_delta(state, _pull(2, "open", NEW), LAST_SYNC)
+    assert state["open_prs"] == {1, 2}
+    # A new item was never counted as closed, so nothing is subtracted.
+    assert state["closed_prs"] == 5
+
+def test_untouched_closed_and_open_items_keep_counts():
+    state = _state()
+    # An already-closed item updated again (e.g. a new comment) stays counted once.
+    apply_item_delta(state, _pull(3, "closed", OLD), LAST_SYNC)
+    apply_item_delta(state, _issue(10, "open", OLD), LAST_SYNC)
+    assert state == _state()
+
+def test_reopen_never_drives_closed_count_negative():
+    state = {**_state(), "closed_issues": 0}
+    apply_item_delta(state, _issue(11, "open", OLD), LAST_SYNC)
+    assert state["closed_issues"] == 0
+
+def _client(tmp_path: Path) -> GitHubAPIClient:
+    config = {
+        "github": {
+            "api_base_url": "https://api.github.invalid",
+            "repositories": ["octo/repo"],
+            "rate_limit_delay": 0,
+            "timeout": 1,
+            "metrics_mode": "incremental",
+            "sync_state_file": str(tmp_path / "sync_state.json"),
+        },
+    }
+    return GitHubAPIClient(config)
+
+def test_baseline_not_saved_when_closed_count_fails(tmp_path):
+    client = _client(tmp_path)
+    client._make_request = lambda url, params=None: [{"number": 1, "pull_request": {}}, {"number": 10}]
+    # The closed count requests fail after all retries.
+    client._request = lambda url, params=None, json_body=None: None
+    assert client.sync_repository_counts("octo/repo") is None
+    assert client.sync_state.get("octo/repo") is None
+    client.sync_state.save()
+    assert SyncStateStore(tmp_path / "sync_state.json").get("octo/repo") is None